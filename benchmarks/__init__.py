@@ -0,0 +1,11 @@
+"""
+Micro-benchmarks for the Monoprice HTP-1 integration.
+
+Run from the repository root. ``python -m benchmarks`` runs the device and
+browser suites; ``--save FILE`` records a run and ``--compare FILE`` reports
+the change against one. Single suites run as e.g.
+``python -m benchmarks.bench_patch``.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
@@ -0,0 +1,45 @@
+"""
+Run the benchmark suite: ``python -m benchmarks [--quick] [--save FILE] [--compare FILE]``.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from benchmarks import bench_browser, bench_device
+from benchmarks.harness import REGRESSION_THRESHOLD, compare, print_results, save
+
+
+async def run(quick: bool) -> list:
+    results = await bench_device.run_all(quick)
+    results.extend(await bench_browser.run_all(quick))
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, skip the 100k catalogue")
+    parser.add_argument("--save", metavar="FILE", help="write results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="compare with a saved JSON run")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="slowdown fraction reported as a regression (default %(default)s)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR, force=True)
+    results = asyncio.run(run(args.quick))
+    print_results(results)
+    if args.save:
+        save(args.save, results)
+    if args.compare:
+        return 1 if compare(args.compare, results, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
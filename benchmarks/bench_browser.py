@@ -0,0 +1,56 @@
+"""
+Benchmark BEQ catalogue search, category browsing and media id generation.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from ucapi.api_definitions import Paging
+from ucapi.media_player import SearchOptions
+
+from benchmarks.fixtures import build_catalogue
+from benchmarks.harness import Result, measure, measure_async, print_results
+from intg_monoprice_htp1 import browser
+
+CATALOGUE_SIZES = (1_000, 10_000, 100_000)
+
+
+async def run_all(quick: bool = False) -> list[Result]:
+    results = []
+    sizes = CATALOGUE_SIZES[:2] if quick else CATALOGUE_SIZES
+    for size in sizes:
+        catalogue = build_catalogue(size)
+        browser._beq_cache = catalogue
+        browser._beq_lookup = {}
+        label = f"{size // 1000}k"
+        number = 3 if quick else 20
+
+        # A common word matches everything; the first page fills quickly.
+        for query in ("part", f"title {size - 1:06d}"):
+            options = SearchOptions(query=query, paging=Paging(page=1, limit=50))
+            results.append(await measure_async(
+                f"search '{query[:10]}' [{label}]", lambda o=options: browser.search(None, o), number=number,
+            ))
+
+        results.append(await measure_async(
+            f"_browse_category film [{label}]", lambda: browser._browse_category("film", 1), number=number,
+        ))
+        entries = catalogue[:50]
+        results.append(measure(
+            f"_build_beq_media_id [{label}]",
+            lambda: [browser._build_beq_media_id(e) for e in entries],
+            ops=len(entries),
+            number=number,
+        ))
+
+    browser._beq_cache = None
+    browser._beq_lookup = {}
+    return results
+
+
+if __name__ == "__main__":
+    print_results(asyncio.run(run_all()))
@@ -0,0 +1,53 @@
+"""
+Compare JSON codec backends on mso and changemso payloads.
+
+Pass recorded mso files (the JSON after ``mso ``) as arguments to benchmark
+real captures; otherwise synthetic documents from fixtures are used.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+from pathlib import Path
+
+from benchmarks.fixtures import build_mso, peq_writes
+from intg_monoprice_htp1.codec import available_codecs
+
+
+def load_payloads(paths: list[str]) -> dict[str, str]:
+    if paths:
+        return {Path(p).name: Path(p).read_text(encoding="utf-8") for p in paths}
+    return {
+        "mso 1 sub": json.dumps(build_mso(subs=1)),
+        "mso 4 subs": json.dumps(build_mso(subs=4)),
+    }
+
+
+def run(paths: list[str], number: int = 200) -> None:
+    codecs = available_codecs()
+    payloads = load_payloads(paths)
+    changemso = peq_writes(subs=2)[0]
+
+    print(f"{'payload':<24} {'bytes':>8} " + " ".join(f"{name + ' us':>12}" for name in codecs))
+    for label, text in payloads.items():
+        timings = []
+        for loads, _ in codecs.values():
+            seconds = min(timeit.repeat(lambda: loads(text), number=number, repeat=3))
+            timings.append(seconds / number * 1e6)
+        print(f"{'decode ' + label:<24} {len(text):>8} " + " ".join(f"{t:>12.1f}" for t in timings))
+
+    encoded = json.dumps(changemso, separators=(",", ":"))
+    timings = []
+    for _, dumps in codecs.values():
+        seconds = min(timeit.repeat(lambda: dumps(changemso), number=number, repeat=3))
+        timings.append(seconds / number * 1e6)
+    print(f"{'encode BEQ changemso':<24} {len(encoded):>8} " + " ".join(f"{t:>12.1f}" for t in timings))
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:])
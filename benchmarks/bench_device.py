@@ -0,0 +1,134 @@
+"""
+Benchmark HTP1Device message handling, state derivation, entity fan-out and BEQ op generation.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+
+from benchmarks.fixtures import MSO_SIZES, beq_filters, build_mso, format_changes, input_switches, volume_sweep
+from benchmarks.harness import Result, measure, measure_async, print_results
+from intg_monoprice_htp1.config import HTP1Config
+from intg_monoprice_htp1.device import HTP1Device
+from intg_monoprice_htp1.media_player import HTP1MediaPlayer
+from intg_monoprice_htp1.outbound import Priority
+from intg_monoprice_htp1.remote import HTP1Remote
+from intg_monoprice_htp1.selector import create_selects
+from intg_monoprice_htp1.sensor import create_sensors
+
+
+class BenchDevice(HTP1Device):
+    """HTP1Device that counts outgoing frames instead of sending them."""
+
+    sent = 0
+
+    async def send_message(self, message: str, priority: Priority = Priority.NORMAL, key: Any = None) -> bool:
+        self.sent += 1
+        return True
+
+
+async def make_device(subs: int = 1, peq_slots: int = 16) -> BenchDevice:
+    device = BenchDevice(HTP1Config("bench", "Bench", "127.0.0.1"))
+    await device.handle_message("mso " + json.dumps(build_mso(subs, peq_slots)))
+    return device
+
+
+async def bench_handle_message(quick: bool = False) -> list[Result]:
+    results = []
+    streams = {
+        "volume sweep": volume_sweep(),
+        "input switches": input_switches(),
+        "format changes": format_changes(),
+    }
+    for size, (subs, slots) in MSO_SIZES.items():
+        device = await make_device(subs, slots)
+        for label, stream in streams.items():
+            frames = ["msoupdate " + json.dumps(frame) for frame in stream]
+
+            async def run(frames=frames, device=device):
+                for frame in frames:
+                    await device.handle_message(frame)
+
+            results.append(await measure_async(
+                f"handle_message {label} [{size}]", run, ops=len(frames), number=2 if quick else 10,
+            ))
+    return results
+
+
+async def bench_parse_state(quick: bool = False) -> list[Result]:
+    results = []
+    number = 20 if quick else 200
+    for size, (subs, slots) in MSO_SIZES.items():
+        device = await make_device(subs, slots)
+        results.append(measure(f"_parse_state full [{size}]", device._parse_state, number=number))
+        results.append(measure(
+            f"_parse_state /volume [{size}]", lambda d=device: d._parse_state(["/volume"]), number=number,
+        ))
+        results.append(measure(
+            f"_parse_state one PEQ slot [{size}]",
+            lambda d=device: d._parse_state(["/peq/slots/3/channels/sub1/Fc"]),
+            number=number,
+        ))
+    return results
+
+
+async def bench_fan_out(quick: bool = False) -> list[Result]:
+    """push_update cost with the real entity subscriptions, callbacks replaced by counters."""
+    config = HTP1Config("bench", "Bench", "127.0.0.1")
+    device = await make_device()
+    HTP1MediaPlayer(config, device)
+    HTP1Remote(config, device)
+    create_sensors(config, device)
+    create_selects(config, device)
+
+    woken = 0
+
+    async def callback():
+        nonlocal woken
+        woken += 1
+
+    device._subscribers = [(keys, callback) for keys, _ in device._subscribers]
+    results = []
+    for label, changed in (("volume", {"volume"}), ("input", {"input", "source_list"}), ("all", None)):
+        woken = 0
+
+        async def run(changed=changed):
+            device.push_update(changed)
+            await asyncio.sleep(0)
+
+        number = 20 if quick else 200
+        result = await measure_async(f"push_update {label}", run, number=number)
+        result.extra["subscribers"] = len(device._subscribers)
+        result.extra["woken_per_push"] = woken / (number * 5)
+        results.append(result)
+    return results
+
+
+async def bench_load_beq(quick: bool = False) -> list[Result]:
+    results = []
+    for subs in (1, 4):
+        device = await make_device(subs, 16)
+        filters = beq_filters(10)
+        result = await measure_async(
+            f"load_beq 10 filters [{subs} sub]",
+            lambda d=device: d.load_beq("Bench", filters),
+            number=5 if quick else 50,
+        )
+        results.append(result)
+    return results
+
+
+async def run_all(quick: bool = False) -> list[Result]:
+    results = []
+    for bench in (bench_handle_message, bench_parse_state, bench_fan_out, bench_load_beq):
+        results.extend(await bench(quick))
+    return results
+
+
+if __name__ == "__main__":
+    print_results(asyncio.run(run_all()))
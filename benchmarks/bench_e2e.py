@@ -0,0 +1,94 @@
+"""
+End-to-end runs of HTP1Device against the local simulator.
+
+Measures time to a ready mirror, command round trips through the echo,
+a BEQ load, and how many unsolicited updates per second are absorbed.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from benchmarks.fixtures import beq_filters
+from benchmarks.simulator import HTP1Simulator, SimulatorConfig
+from intg_monoprice_htp1.config import HTP1Config
+from intg_monoprice_htp1.device import HTP1Device
+
+
+async def _wait_for(predicate, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.005)
+    return True
+
+
+async def run(config: SimulatorConfig, commands: int = 50, burst: float = 0.0, burst_seconds: float = 2.0) -> None:
+    # Behave as on the Remote: no BEQ catalogue prefetch from the internet.
+    os.environ.setdefault("INVOCATION_ID", "simulator")
+    simulator = HTP1Simulator(config)
+    await simulator.start()
+    device = HTP1Device(HTP1Config("sim", "Simulator", simulator.address))
+    try:
+        started = time.monotonic()
+        await device.connect()
+        if not await _wait_for(device._state_ready.is_set):
+            print("device never became ready")
+            return
+        print(f"ready after {(time.monotonic() - started) * 1000:.1f} ms")
+
+        async def round_trip(command) -> None:
+            before = device.latency.samples
+            await command
+            await _wait_for(lambda: device.latency.samples > before)
+
+        for i in range(commands):
+            await round_trip(device.set_volume(-50 + i % 30))
+        await round_trip(device.mute_toggle(True))
+        await round_trip(device.select_source("H2"))
+        await device.send_http_command("menu")
+
+        started = time.monotonic()
+        await round_trip(device.load_beq("Simulator", beq_filters(10)))
+        print(f"BEQ load echoed after {(time.monotonic() - started) * 1000:.1f} ms")
+
+        if burst:
+            simulator.set_burst(burst)
+            version = device.state_version
+            await asyncio.sleep(burst_seconds)
+            simulator.set_burst(0)
+            rate = (device.state_version - version) / burst_seconds
+            print(f"absorbed {rate:.0f} msoupdates/s at a burst rate of {burst:.0f}/s")
+
+        print(device.latency.report())
+        print(simulator.stats)
+    finally:
+        await device.disconnect()
+        await simulator.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_e2e")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--burst", type=float, default=0.0)
+    parser.add_argument("--commands", type=int, default=50)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, force=True)
+    asyncio.run(run(
+        SimulatorConfig(latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000, seed=1),
+        commands=args.commands,
+        burst=args.burst,
+    ))
+
+
+if __name__ == "__main__":
+    main()
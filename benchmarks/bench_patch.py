@@ -0,0 +1,73 @@
+"""
+Compare the RFC 6902 patch engine with the original inline msoupdate loop.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import copy
+import timeit
+from typing import Any
+
+from benchmarks.fixtures import build_mso, input_switches, peq_writes, volume_sweep
+from intg_monoprice_htp1.patch import apply_patch
+
+
+def legacy_apply(state: dict[str, Any], data: list[dict[str, Any]]) -> None:
+    """The add/replace/remove loop handle_message used before patch.py."""
+    for piece in data:
+        op = piece.get("op")
+        path = piece.get("path", "")[1:].split("/")
+        target = state
+        final = path.pop()
+
+        if op == "remove":
+            for node in path:
+                if isinstance(target, list):
+                    node = int(node)
+                target = target[node]
+            if isinstance(target, dict):
+                target.pop(final, None)
+            elif isinstance(target, list):
+                del target[int(final)]
+            continue
+
+        if op not in ("add", "replace"):
+            continue
+
+        for node in path:
+            if isinstance(target, list):
+                node = int(node)
+            target = target[node]
+        target[final] = piece.get("value")
+
+
+def engine_apply(state: dict[str, Any], data: list[dict[str, Any]]) -> None:
+    apply_patch(state, data)
+
+
+def run(number: int = 200) -> None:
+    streams = {
+        "volume sweep": volume_sweep(),
+        "input switches": input_switches(),
+        "BEQ load (2 subs)": peq_writes(subs=2),
+    }
+    print(f"{'stream':<20} {'legacy us/frame':>16} {'engine us/frame':>16}")
+    for label, stream in streams.items():
+        results = []
+        for fn in (legacy_apply, engine_apply):
+            state = copy.deepcopy(build_mso(subs=2))
+
+            def apply_all(fn=fn, state=state):
+                for frame in stream:
+                    fn(state, frame)
+
+            seconds = min(timeit.repeat(apply_all, number=number, repeat=3))
+            results.append(seconds / (number * len(stream)) * 1e6)
+        print(f"{label:<20} {results[0]:>16.2f} {results[1]:>16.2f}")
+
+
+if __name__ == "__main__":
+    run()
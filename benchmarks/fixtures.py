@@ -0,0 +1,175 @@
+"""
+Synthetic HTP-1 mso documents and msoupdate streams for benchmarks.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+INPUT_IDS = [
+    "h1", "h2", "h3", "h4", "h5", "h6", "h7", "h8",
+    "a1", "a2", "o1", "o2", "o3", "c1", "c2", "c3", "usb", "bt",
+]
+
+
+def build_mso(subs: int = 1, peq_slots: int = 16) -> dict[str, Any]:
+    """Build an mso document shaped like the one the HTP-1 sends on getmso."""
+    sub_names = [f"sub{i}" for i in range(1, subs + 1)]
+    channels = ["lf", "rf", "c", "ls", "rs", "lb", "rb", *sub_names]
+    return {
+        "powerIsOn": True,
+        "muted": False,
+        "volume": -40,
+        "input": "h1",
+        "loudness": "off",
+        "night": "off",
+        "cal": {
+            "zeroPoint": 0,
+            "vpl": -80,
+            "vph": 12,
+            "diracactive": "on",
+            "currentdiracslot": 0,
+            "slots": [{"name": f"Slot {i + 1}", "valid": i < 3} for i in range(6)],
+        },
+        "shaker": {
+            "mute": "off",
+            "activePreset": 0,
+            "presets": {str(i): {"trim": 0, "name": f"Preset {i + 1}"} for i in range(6)},
+        },
+        "inputs": {
+            inp: {"label": inp.upper(), "visible": True, "format": "auto", "gain": 0}
+            for inp in INPUT_IDS
+        },
+        "peq": {
+            "peqsw": True,
+            "location": "post",
+            "slots": [
+                {
+                    "channels": {
+                        ch: {"Fc": 100, "gaindB": 0, "Q": 1, "FilterType": 0}
+                        for ch in channels
+                    }
+                }
+                for _ in range(peq_slots)
+            ],
+        },
+        "speakers": {
+            "groups": {
+                **{ch: {"present": True, "size": "l"} for ch in channels if not ch.startswith("sub")},
+                **{sub: {"present": True} for sub in sub_names},
+            }
+        },
+        "upmix": {"select": "dolby", "dolby": {"cnt": True}, "dts": {"dialogEnh": 0}},
+        "status": {
+            "DECSourceProgram": "Dolby Atmos",
+            "DECProgramFormat": "7.1.4",
+            "SurroundMode": "Dolby",
+            "ENCListeningFormat": "7.1.4",
+        },
+        "videostat": {
+            "VideoResolution": "3840x2160p24",
+            "HDRstatus": "HDR10",
+            "VideoColorSpace": "YCbCr 4:2:2",
+            "VideoMode": "",
+            "VideoBitDepth": "12 bits",
+        },
+    }
+
+
+def volume_sweep(start: int = -60, stop: int = -20) -> list[list[dict[str, Any]]]:
+    """One msoupdate per dB step, as sent while the volume knob turns."""
+    step = 1 if stop >= start else -1
+    return [[{"op": "replace", "path": "/volume", "value": v}] for v in range(start, stop + step, step)]
+
+
+def input_switches(count: int = 50) -> list[list[dict[str, Any]]]:
+    """Input changes followed by the status/video renegotiation the processor reports."""
+    stream = []
+    for i in range(count):
+        stream.append([{"op": "replace", "path": "/input", "value": INPUT_IDS[i % 8]}])
+        stream.append([
+            {"op": "replace", "path": "/status/DECSourceProgram", "value": "PCM" if i % 2 else "Dolby Atmos"},
+            {"op": "replace", "path": "/status/DECProgramFormat", "value": "2.0" if i % 2 else "7.1.4"},
+        ])
+        stream.append([{"op": "replace", "path": "/videostat/HDRstatus", "value": "SDR" if i % 2 else "HDR10"}])
+    return stream
+
+
+def peq_writes(subs: int = 1, slots: int = 16) -> list[list[dict[str, Any]]]:
+    """A BEQ load as echoed back: five ops per slot per sub in one frame."""
+    ops = []
+    for i in range(slots):
+        for n in range(1, subs + 1):
+            base = f"/peq/slots/{i}/channels/sub{n}"
+            ops.extend([
+                {"op": "replace", "path": f"{base}/Fc", "value": 20 + i},
+                {"op": "replace", "path": f"{base}/gaindB", "value": 3},
+                {"op": "replace", "path": f"{base}/Q", "value": 0.7},
+                {"op": "replace", "path": f"{base}/FilterType", "value": 1},
+                {"op": "add", "path": f"{base}/beq", "value": True},
+            ])
+    return [ops]
+
+
+# Sizes used by the benchmark suite: (subs, PEQ slots).
+MSO_SIZES = {
+    "small": (1, 4),
+    "typical": (1, 16),
+    "large": (4, 16),
+}
+
+_FORMATS = [
+    ("Dolby Atmos", "7.1.4", "Dolby", "7.1.4"),
+    ("DTS:X", "7.1.4", "DTS", "7.1.4"),
+    ("PCM", "2.0", "Dolby", "7.1.4"),
+    ("Dolby Digital", "5.1", "Dolby", "7.1.4"),
+]
+_CONTENT_TYPES = ["film", "TV", "game", "music"]
+
+
+def format_changes(count: int = 50) -> list[list[dict[str, Any]]]:
+    """Decoder and video format changes, as sent when a source changes program."""
+    stream = []
+    for i in range(count):
+        program, fmt, surround, listening = _FORMATS[i % len(_FORMATS)]
+        stream.append([
+            {"op": "replace", "path": "/status/DECSourceProgram", "value": program},
+            {"op": "replace", "path": "/status/DECProgramFormat", "value": fmt},
+            {"op": "replace", "path": "/status/SurroundMode", "value": surround},
+            {"op": "replace", "path": "/status/ENCListeningFormat", "value": listening},
+            {
+                "op": "replace",
+                "path": "/videostat/VideoResolution",
+                "value": "1920x1080p60" if i % 2 else "3840x2160p24",
+            },
+        ])
+    return stream
+
+
+def beq_filters(count: int = 10) -> list[dict[str, Any]]:
+    """Filters in the shape of a BEQ catalogue entry."""
+    return [
+        {"type": "LowShelf" if i % 3 == 0 else "PeakingEQ", "freq": 20 + i * 5, "gain": 3.5 - i * 0.5, "q": 0.7}
+        for i in range(count)
+    ]
+
+
+def build_catalogue(size: int = 1000) -> list[dict[str, Any]]:
+    """A BEQ catalogue of ``size`` entries, sorted by title like the cached one."""
+    entries = [
+        {
+            "title": f"Title {i:06d} Part {i % 7}",
+            "year": 1980 + i % 45,
+            "audioTypes": ["DTS-HD MA 7.1"] if i % 2 else ["Atmos"],
+            "author": ["aron7awol", "mobe1969", "halcyon888"][i % 3],
+            "content_type": _CONTENT_TYPES[i % len(_CONTENT_TYPES)],
+            "underlying": f"Title {i:06d}",
+            "filters": [dict(f, biquads=[]) for f in beq_filters(4)],
+        }
+        for i in range(size)
+    ]
+    entries.sort(key=lambda e: e["title"])
+    return entries
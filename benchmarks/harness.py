@@ -0,0 +1,127 @@
+"""
+Timing, result files and run-to-run comparison for the benchmark suite.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+REPEAT = 5
+REGRESSION_THRESHOLD = 0.10
+
+
+@dataclass(slots=True)
+class Result:
+    """Per-operation timing of one benchmark, in microseconds."""
+
+    name: str
+    best_us: float
+    median_us: float
+    ops: int
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+def _summarize(name: str, runs: list[float], ops: int, extra: dict[str, Any] | None) -> Result:
+    per_op = [seconds / ops * 1e6 for seconds in runs]
+    return Result(name, min(per_op), statistics.median(per_op), ops, extra or {})
+
+
+def measure(name: str, fn: Callable[[], Any], ops: int = 1, number: int = 10,
+            repeat: int = REPEAT, extra: dict[str, Any] | None = None) -> Result:
+    """Time ``number`` calls of ``fn``, each doing ``ops`` operations, ``repeat`` times."""
+    runs = []
+    # Like timeit, keep the collector from landing in some repeats and not others.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                fn()
+            runs.append(time.perf_counter() - started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return _summarize(name, runs, ops * number, extra)
+
+
+async def measure_async(name: str, fn: Callable[[], Awaitable[Any]], ops: int = 1, number: int = 10,
+                        repeat: int = REPEAT, extra: dict[str, Any] | None = None) -> Result:
+    """Like :func:`measure` for a coroutine function, run on the current loop."""
+    runs = []
+    # Like timeit, keep the collector from landing in some repeats and not others.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                await fn()
+            runs.append(time.perf_counter() - started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return _summarize(name, runs, ops * number, extra)
+
+
+def environment() -> dict[str, Any]:
+    from intg_monoprice_htp1 import codec
+
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = ""
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "codec": codec.BACKEND,
+        "revision": revision,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def print_results(results: list[Result]) -> None:
+    print(f"{'benchmark':<48} {'best us/op':>12} {'median us/op':>13} {'ops':>8}")
+    for r in results:
+        print(f"{r.name:<48} {r.best_us:>12.2f} {r.median_us:>13.2f} {r.ops:>8}")
+
+
+def save(path: str, results: list[Result]) -> None:
+    data = {"environment": environment(), "results": {r.name: asdict(r) for r in results}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def compare(baseline_path: str, results: list[Result], threshold: float = REGRESSION_THRESHOLD) -> int:
+    """Print best-time deltas against a saved run; returns the number of regressions."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    env = baseline.get("environment", {})
+    print(f"\nCompared with {baseline_path} ({env.get('revision') or 'unknown'}, {env.get('timestamp', '')})")
+    print(f"{'benchmark':<48} {'before':>10} {'after':>10} {'change':>9}")
+    regressions = 0
+    for r in results:
+        before = baseline.get("results", {}).get(r.name)
+        if not before:
+            print(f"{r.name:<48} {'-':>10} {r.best_us:>10.2f} {'new':>9}")
+            continue
+        change = (r.best_us - before["best_us"]) / before["best_us"] if before["best_us"] else 0.0
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{r.name:<48} {before['best_us']:>10.2f} {r.best_us:>10.2f} {change:>+8.1%}{flag}")
+    return regressions
@@ -0,0 +1,241 @@
+"""
+Local stand-in for a Monoprice HTP-1 processor.
+
+Serves the ``/ws/controller`` WebSocket and the ``/ircmd`` HTTP endpoint.
+getmso is answered with a fixture mso, and changemso operations are applied
+and echoed as msoupdate. Latency, unsolicited update bursts, dropped
+connections and malformed frames can be configured for load and failure
+testing. Point the integration (or the setup flow) at ``127.0.0.1:<port>``.
+
+    python -m benchmarks.simulator --port 8080 --latency-ms 20 --burst 50
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import WSMsgType, web
+
+from benchmarks.fixtures import build_mso
+from intg_monoprice_htp1.patch import apply_patch
+
+_LOG = logging.getLogger(__name__)
+
+_MALFORMED_FRAMES = (
+    "msoupdate [{\"op\":\"replace\",\"path\":\"/volume\"",
+    "msoupdate {\"op\":\"replace\"}",
+    "msoupdate [{\"op\":\"replace\",\"path\":\"/does/not/exist\",\"value\":1}]",
+    "mso",
+    "\x00\x01garbage",
+)
+
+
+@dataclass
+class SimulatorConfig:
+    """Behaviour knobs; all default to a well-behaved, instant device."""
+
+    latency: float = 0.0  # seconds before each reply
+    jitter: float = 0.0  # extra random delay, up to this many seconds
+    burst_rate: float = 0.0  # unsolicited msoupdates per second
+    drop_every: float = 0.0  # close client connections every N seconds
+    malformed_rate: float = 0.0  # probability an outgoing frame is corrupted
+    subs: int = 1
+    peq_slots: int = 16
+    seed: int | None = None
+
+
+@dataclass
+class SimulatorStats:
+    frames_in: int = 0
+    frames_out: int = 0
+    changemso: int = 0
+    ircmd: int = 0
+    drops: int = 0
+    malformed: int = 0
+    ir_codes: list[str] = field(default_factory=list)
+
+
+class HTP1Simulator:
+    """An aiohttp application that behaves like an HTP-1 on the wire."""
+
+    def __init__(self, config: SimulatorConfig | None = None, mso: dict[str, Any] | None = None):
+        self.config = config or SimulatorConfig()
+        self.mso = mso if mso is not None else build_mso(self.config.subs, self.config.peq_slots)
+        self.stats = SimulatorStats()
+        self._random = random.Random(self.config.seed)
+        self._clients: set[web.WebSocketResponse] = set()
+        self._tasks: list[asyncio.Task] = []
+        self._burst_task: asyncio.Task | None = None
+        self._runner: web.AppRunner | None = None
+        self.port: int | None = None
+
+    @property
+    def address(self) -> str:
+        """Host value to configure in the integration."""
+        return f"127.0.0.1:{self.port}"
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        app = web.Application()
+        app.router.add_get("/ws/controller", self._handle_ws)
+        app.router.add_get("/ircmd", self._handle_ircmd)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self.set_burst(self.config.burst_rate)
+        if self.config.drop_every > 0:
+            self._tasks.append(asyncio.create_task(self._drop_loop()))
+        _LOG.info("HTP-1 simulator listening on %s:%d", host, self.port)
+
+    def set_burst(self, rate: float) -> None:
+        """Start, retune or (with 0) stop the unsolicited update stream."""
+        self.config.burst_rate = rate
+        if self._burst_task:
+            self._burst_task.cancel()
+            self._burst_task = None
+        if rate > 0:
+            self._burst_task = asyncio.create_task(self._burst_loop())
+
+    async def stop(self) -> None:
+        self.set_burst(0)
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+        for ws in list(self._clients):
+            await ws.close()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _delay(self) -> None:
+        delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _send(self, ws: web.WebSocketResponse, frame: str) -> None:
+        if self.config.malformed_rate and self._random.random() < self.config.malformed_rate:
+            frame = self._random.choice(_MALFORMED_FRAMES)
+            self.stats.malformed += 1
+        if ws.closed:
+            return
+        try:
+            await ws.send_str(frame)
+            self.stats.frames_out += 1
+        except ConnectionError:
+            pass
+
+    async def _broadcast(self, frame: str) -> None:
+        for ws in list(self._clients):
+            await self._send(ws, frame)
+
+    async def _handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._clients.add(ws)
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                self.stats.frames_in += 1
+                await self._handle_frame(ws, msg.data)
+        finally:
+            self._clients.discard(ws)
+        return ws
+
+    async def _handle_frame(self, ws: web.WebSocketResponse, frame: str) -> None:
+        cmd, _, payload = frame.partition(" ")
+        if cmd == "getmso":
+            await self._delay()
+            await self._send(ws, "mso " + json.dumps(self.mso))
+        elif cmd == "changemso":
+            self.stats.changemso += 1
+            try:
+                operations = json.loads(payload)
+            except ValueError:
+                return
+            result = apply_patch(self.mso, operations)
+            self.mso = result.document
+            if result.applied:
+                await self._delay()
+                await self._broadcast("msoupdate " + json.dumps(operations[: result.applied]))
+
+    async def _handle_ircmd(self, request: web.Request) -> web.Response:
+        self.stats.ircmd += 1
+        self.stats.ir_codes.append(request.query.get("code", ""))
+        await self._delay()
+        return web.Response(text="OK")
+
+    async def _burst_loop(self) -> None:
+        """Unsolicited updates like a volume knob turning and the decoder renegotiating."""
+        interval = 1 / self.config.burst_rate
+        step = 0
+        while True:
+            await asyncio.sleep(interval)
+            step += 1
+            if step % 10:
+                volume = -60 + step % 40
+                operations = [{"op": "replace", "path": "/volume", "value": volume}]
+            else:
+                program = "PCM" if step % 20 else "Dolby Atmos"
+                operations = [{"op": "replace", "path": "/status/DECSourceProgram", "value": program}]
+            self.mso = apply_patch(self.mso, operations).document
+            await self._broadcast("msoupdate " + json.dumps(operations))
+
+    async def _drop_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.config.drop_every)
+            for ws in list(self._clients):
+                self.stats.drops += 1
+                await ws.close()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    simulator = HTP1Simulator(SimulatorConfig(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        burst_rate=args.burst,
+        drop_every=args.drop_every,
+        malformed_rate=args.malformed,
+        subs=args.subs,
+        seed=args.seed,
+    ))
+    await simulator.start(args.host, args.port)
+    try:
+        while True:
+            await asyncio.sleep(10)
+            _LOG.info("%s", simulator.stats)
+    finally:
+        await simulator.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--burst", type=float, default=0.0, help="unsolicited msoupdates per second")
+    parser.add_argument("--drop-every", type=float, default=0.0, help="drop connections every N seconds")
+    parser.add_argument("--malformed", type=float, default=0.0, help="fraction of frames to corrupt")
+    parser.add_argument("--subs", type=int, default=1)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)-8s | %(message)s")
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
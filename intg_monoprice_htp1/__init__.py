@@ -13,6 +13,7 @@ from pathlib import Path
 
 from ucapi import DeviceStates
 from ucapi_framework import get_config_path, BaseConfigManager
+from intg_monoprice_htp1 import metrics, profiler
 from intg_monoprice_htp1.driver import HTP1Driver
 from intg_monoprice_htp1.setup_flow import HTP1SetupFlow
 from intg_monoprice_htp1.config import HTP1Config
@@ -54,6 +55,10 @@ async def main():
     await driver.api.init(os.path.abspath(driver_path), setup_handler)
     await driver.register_all_device_instances(connect=False)
 
+    if metrics.ENABLED:
+        await metrics.start_server()
+    profiler.start(config_path)
+
     device_count = len(list(config_manager.all()))
     await driver.api.set_device_state(
         DeviceStates.CONNECTED if device_count > 0 else DeviceStates.DISCONNECTED
@@ -28,6 +28,8 @@ from ucapi.media_player import (
     SearchResults,
 )
 
+from intg_monoprice_htp1 import metrics, profiler
+
 if TYPE_CHECKING:
     from intg_monoprice_htp1.device import HTP1Device
 
@@ -82,6 +84,7 @@ async def _fetch_beq_catalogue() -> list[dict]:
                 return _beq_cache
 
         _LOG.info("Fetching BEQ catalogue from %s", BEQ_DB_URL)
+        started = time.monotonic()
         try:
             connector = aiohttp.TCPConnector(ssl=False)
             async with aiohttp.ClientSession(connector=connector) as session:
@@ -95,6 +98,8 @@ async def _fetch_beq_catalogue() -> list[dict]:
                         _beq_cache = data
                         _beq_cache_timestamp = int(time.time())
                         _LOG.info("BEQ catalogue loaded: %d entries", len(data))
+                        metrics.observe("htp1_beq_fetch_seconds", time.monotonic() - started)
+                        metrics.set_gauge("htp1_beq_catalogue_entries", len(data))
                         return data
         except Exception as err:
             _LOG.error("BEQ catalogue fetch error: %s", err)
@@ -171,6 +176,8 @@ async def browse(device: HTP1Device, options: BrowseOptions) -> BrowseResults |
     return StatusCodes.NOT_FOUND
 
 
+@profiler.profiled
+@metrics.timed("htp1_search_seconds")
 async def search(device: HTP1Device, options: SearchOptions) -> SearchResults | StatusCodes:
     
     query = options.query.lower().strip()
@@ -343,6 +350,7 @@ async def _browse_categories() -> BrowseResults:
     )
 
 
+@profiler.profiled
 async def _browse_category(content_type: str, page: int = 1) -> BrowseResults:
     if _beq_cache is None:
         if not await _wait_for_cache():
@@ -0,0 +1,96 @@
+"""
+JSON codec for HTP-1 WebSocket frames.
+
+Uses orjson or msgspec when installed and falls back to the standard
+library otherwise. Set ``HTP1_JSON_CODEC`` to force a specific backend.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Callable
+from typing import Any
+
+_LOG = logging.getLogger(__name__)
+
+Loads = Callable[[str | bytes], Any]
+Dumps = Callable[[Any], str]
+
+
+def _stdlib_codec() -> tuple[Loads, Dumps]:
+    encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+    return json.loads, encoder.encode
+
+
+def _orjson_codec() -> tuple[Loads, Dumps]:
+    import orjson
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    return orjson.loads, dumps
+
+
+def _msgspec_codec() -> tuple[Loads, Dumps]:
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+
+    def dumps(obj: Any) -> str:
+        return encoder.encode(obj).decode()
+
+    return decoder.decode, dumps
+
+
+CODECS: dict[str, Callable[[], tuple[Loads, Dumps]]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": _stdlib_codec,
+}
+
+
+def available_codecs() -> dict[str, tuple[Loads, Dumps]]:
+    """Return every backend that can be imported, fastest first."""
+    codecs = {}
+    for name, factory in CODECS.items():
+        try:
+            codecs[name] = factory()
+        except ImportError:
+            continue
+    return codecs
+
+
+def _select_codec() -> tuple[str, Loads, Dumps]:
+    preferred = os.getenv("HTP1_JSON_CODEC", "").lower()
+    names = [preferred] if preferred in CODECS else []
+    if preferred and not names:
+        _LOG.warning("Unknown HTP1_JSON_CODEC=%r, using auto-detection", preferred)
+    for name in [*names, *CODECS]:
+        try:
+            loads_fn, dumps_fn = CODECS[name]()
+        except ImportError:
+            if name == preferred:
+                _LOG.warning("JSON codec %s is not installed, using auto-detection", name)
+            continue
+        return name, loads_fn, dumps_fn
+    raise RuntimeError("No JSON codec available")
+
+
+def _decode_errors(name: str) -> tuple[type[Exception], ...]:
+    if name == "msgspec":
+        import msgspec
+
+        # Named explicitly rather than relying on it subclassing ValueError.
+        return ValueError, msgspec.DecodeError
+    return (ValueError,)
+
+
+BACKEND, loads, dumps = _select_codec()
+# Exceptions ``loads`` raises on malformed input with the active backend.
+DecodeError = _decode_errors(BACKEND)
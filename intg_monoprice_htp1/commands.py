@@ -0,0 +1,282 @@
+"""
+Command registry shared by the Remote, Media Player and Select entities.
+
+Every entity command is declared once below with its parameter schema and
+target: a device method, or a Remote code that the device sends as a
+changemso or IR (see :mod:`intg_monoprice_htp1.routing`). The declarations
+are compiled at import into one lookup table that entities dispatch through.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from ucapi import StatusCodes
+from ucapi.media_player import Commands as MediaPlayerCommands
+
+from intg_monoprice_htp1 import metrics
+
+if TYPE_CHECKING:
+    from intg_monoprice_htp1.device import HTP1Device
+
+_LOG = logging.getLogger(__name__)
+
+# Command groups; "send" holds the Remote's simple commands (send_cmd).
+REMOTE = "remote"
+SEND = "send"
+MEDIA_PLAYER = "media_player"
+SELECT = "select"
+
+# Remote simple command -> HTP-1 IR code.
+HTTP_COMMANDS = {
+    "VOLUME_DOWN": "09f6",
+    "Mute Toggle": "0af5",
+    "VOLUME_UP": "0bf4",
+    "Mode None": "1be4",
+    "Mode Dolby Sur": "1ce3",
+    "Mode Neural-X": "1de2",
+    "Mode Native": "1ee1",
+    "Mode Auro": "1fe0",
+    "Night Toggle": "40bf",
+    "Dialog Up": "41be",
+    "Dialog Down": "42bd",
+    "Dirac Toggle": "47b8",
+    "Loudness Toggle": "5aa5",
+    "User Input 1": "609f",
+    "User Input 2": "619e",
+    "User Input 3": "629d",
+    "User Input 4": "639c",
+    "User Input 5": "649b",
+    "User Input 6": "659a",
+    "User Input 7": "6699",
+    "User Input 8": "6798",
+    "User Input 9": "6897",
+    "Last Input": "44bb",
+    "BT Pair": "59a6",
+    "HDMI+": "4db2",
+    "SPDIF+": "4eb1",
+    "Analog+": "4fb0",
+    "Stream+": "50af",
+    "Red": "51ae",
+    "Green": "52ad",
+    "Yellow": "53ac",
+    "Blue": "54ab",
+    "A": "55aa",
+    "B": "56a9",
+    "C": "57a8",
+    "D": "58a7",
+    "Preset 1": "03fc",
+    "Preset 2": "04fb",
+    "Preset 3": "05fa",
+    "Preset 4": "06f9",
+    "Info": "43bc",
+    "Dim": "45ba",
+    "Mute On": "4bb4",
+    "Mute Off": "4cb3",
+    "Loud On": "3ac5",
+    "Loud Off": "3bc4",
+    "Night On": "3cc3",
+    "Night Off": "3dc2",
+    "Dirac On": "3ec1",
+    "Dirac Off": "3fc0",
+    "In USB": "2dd2",
+    "In AES": "5ba4",
+    "TV Input": "0ef1",
+    "In HDMI 1": "0ff0",
+    "In HDMI 2": "10ef",
+    "In HDMI 3": "11ee",
+    "In HDMI 4": "12ed",
+    "In HDMI 5": "13ec",
+    "In HDMI 6": "14eb",
+    "In HDMI 7": "15ea",
+    "In HDMI 8": "17e8",
+    "In Bluetooth": "46b9",
+    "In Analog 1": "27d8",
+    "In Analog 2": "28d7",
+    "In Optical 1": "29d6",
+    "In Optical 2": "2ad5",
+    "In Optical 3": "49b6",
+    "In Coaxial 1": "2bd4",
+    "In Coaxial 2": "2cd3",
+    "In Coaxial 3": "48b7",
+    "In Roon": "4ab5",
+    "Tone control Toggle": "708f",
+    "PEQ Toggle": "718e",
+    "Tone control Bass +1": "728d",
+    "Tone control Bass -1": "738c",
+    "Tone control Treble +1": "748b",
+    "Tone control Treble -1": "758a",
+    "Lipsync +1": "7689",
+    "Lipsync -1": "7788",
+    "Dirac Live filter 1": "7887",
+    "Dirac Live filter 2": "7986",
+    "Dirac Live filter 3": "7a85",
+    "Dirac Live filter 4": "7b84",
+    "Dirac Live filter 5": "7c83",
+    "Dirac Live filter 6": "7d82",
+    "Loudness level +1": "7e81",
+    "Loudness level -1": "7f80",
+}
+
+
+Target = Callable[["HTP1Device", list[Any]], Awaitable["bool | StatusCodes"]]
+
+
+@dataclass(frozen=True, slots=True)
+class Param:
+    """A required command parameter and how to convert it."""
+
+    name: str
+    parse: Callable[[Any], Any] = str
+
+
+@dataclass(frozen=True, slots=True)
+class Command:
+    """One entity command: where it is accepted, what it calls and what it needs."""
+
+    group: str
+    name: str
+    target: Target
+    params: tuple[Param, ...] = ()
+
+
+def _text(value: Any) -> str:
+    if not isinstance(value, str) or not value:
+        raise ValueError("expected a non-empty string")
+    return value
+
+
+def method(name: str, *fixed: Any) -> Target:
+    """Call ``device.<name>(*fixed, *params)``."""
+    return lambda device, args: getattr(device, name)(*fixed, *args)
+
+
+def remote_code(command: str) -> Target:
+    """Send an HTTP_COMMANDS entry; the device picks changemso or IR."""
+    return lambda device, args: device.send_remote_command(command)
+
+
+async def _power_toggle(device: HTP1Device, args: list[Any]) -> bool:
+    return await (device.turn_off() if device.power else device.turn_on())
+
+
+async def _play_media(device: HTP1Device, args: list[Any]) -> bool | StatusCodes:
+    from intg_monoprice_htp1 import browser
+
+    media_id = args[0]
+    if media_id == "beq:clear":
+        return await device.clear_beq()
+    if media_id == "beq:reload":
+        return await browser.clear_cache()
+    if not media_id.startswith("beq:"):
+        return StatusCodes.NOT_IMPLEMENTED
+
+    key = media_id[4:]
+    entry = browser.get_beq_entry(key)
+    if not entry:
+        _LOG.error("[%s] BEQ entry not found for key: %s", device.log_id, key)
+        return StatusCodes.BAD_REQUEST
+    filters = entry.get("filters", [])
+    if not filters:
+        return StatusCodes.BAD_REQUEST
+    return await device.load_beq(entry.get("underlying", "Unknown"), filters)
+
+
+COMMANDS: tuple[Command, ...] = (
+    Command(REMOTE, "POWER", _power_toggle),
+    Command(REMOTE, "VOLUME_UP", method("volume_up")),
+    Command(REMOTE, "VOLUME_DOWN", method("volume_down")),
+    Command(REMOTE, "MUTE", lambda device, args: device.mute_toggle(not device.muted)),
+    *(Command(SEND, name, remote_code(name)) for name in HTTP_COMMANDS),
+    Command(SEND, "POWER", _power_toggle),
+    Command(SEND, "Seat Shaker Mute Toggle", lambda device, args: device.ss_mute_toggle(not device.muted)),
+    Command(SEND, "Seat Shaker Trim +1", lambda device, args: device.set_ss_trim(device.ss_trim + 1)),
+    Command(SEND, "Seat Shaker Trim -1", lambda device, args: device.set_ss_trim(device.ss_trim - 1)),
+    *(Command(SEND, f"Seat Shaker Preset {n}", method("select_ss_preset", n - 1)) for n in range(1, 7)),
+    Command(SEND, "send_avcui: hpe", method("send_command", "send_avcui: hpe")),
+    Command(MEDIA_PLAYER, MediaPlayerCommands.ON, method("turn_on")),
+    Command(MEDIA_PLAYER, MediaPlayerCommands.OFF, method("turn_off")),
+    Command(
+        MEDIA_PLAYER, MediaPlayerCommands.VOLUME, method("set_volume_level"),
+        (Param("volume", lambda value: float(value) / 100.0),),
+    ),
+    Command(MEDIA_PLAYER, MediaPlayerCommands.VOLUME_UP, method("volume_up")),
+    Command(MEDIA_PLAYER, MediaPlayerCommands.VOLUME_DOWN, method("volume_down")),
+    Command(MEDIA_PLAYER, MediaPlayerCommands.MUTE_TOGGLE, lambda device, args: device.mute_toggle(not device.muted)),
+    Command(MEDIA_PLAYER, MediaPlayerCommands.MUTE, method("mute_toggle", True)),
+    Command(MEDIA_PLAYER, MediaPlayerCommands.UNMUTE, method("mute_toggle", False)),
+    Command(MEDIA_PLAYER, MediaPlayerCommands.SELECT_SOURCE, method("select_source"), (Param("source", _text),)),
+    Command(MEDIA_PLAYER, MediaPlayerCommands.SELECT_SOUND_MODE, method("select_sound_mode"), (Param("mode", _text),)),
+    Command(MEDIA_PLAYER, MediaPlayerCommands.PLAY_MEDIA, _play_media, (Param("media_id", _text),)),
+    Command(SELECT, "input", method("select_source"), (Param("option", _text),)),
+    Command(SELECT, "calibration", method("select_calibration"), (Param("option", _text),)),
+    Command(SELECT, "surround_mode", method("select_sound_mode"), (Param("option", _text),)),
+    Command(SELECT, "ss_preset", method("select_ss_preset"), (Param("option", lambda value: int(value) - 1),)),
+)
+
+
+class CommandRegistry:
+    """
+    Dispatch table keyed by (group, command name).
+
+    Parameters are validated before the target runs: a missing or
+    unparsable one is a BAD_REQUEST, an unknown command NOT_IMPLEMENTED.
+    Targets return a bool or, when they know better, a status code.
+    """
+
+    def __init__(self, commands: Iterable[Command]):
+        self._table: dict[tuple[str, str], Command] = {}
+        for command in commands:
+            key = (command.group, str(command.name))
+            if key in self._table:
+                raise ValueError(f"Duplicate command {key}")
+            self._table[key] = command
+        self.stats: dict[tuple[str, str], int] = dict.fromkeys(self._table, 0)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._table
+
+    def names(self, group: str) -> list[str]:
+        return [name for command_group, name in self._table if command_group == group]
+
+    async def dispatch(
+        self, group: str, name: str, device: HTP1Device, params: dict[str, Any] | None
+    ) -> StatusCodes:
+        command = self._table.get((group, name))
+        if command is None:
+            return StatusCodes.NOT_IMPLEMENTED
+
+        args = []
+        for param in command.params:
+            if not params or param.name not in params:
+                return StatusCodes.BAD_REQUEST
+            try:
+                args.append(param.parse(params[param.name]))
+            except (TypeError, ValueError):
+                return StatusCodes.BAD_REQUEST
+
+        self.stats[(group, name)] += 1
+        started = time.perf_counter()
+        try:
+            result = await command.target(device, args)
+        except Exception as err:
+            _LOG.error("[%s] %s command %s failed: %s", device.log_id, group, name, err)
+            result = False
+        if isinstance(result, StatusCodes):
+            status = result
+        else:
+            status = StatusCodes.OK if result else StatusCodes.SERVER_ERROR
+        if metrics.ENABLED:
+            metrics.inc("htp1_commands", group=group, command=name, status=status.name.lower())
+            metrics.observe("htp1_command_seconds", time.perf_counter() - started, group=group, command=name)
+        return status
+
+
+REGISTRY = CommandRegistry(COMMANDS)
@@ -5,9 +5,23 @@ Monoprice HTP-1 configuration for Unfolded Circle integration.
 :license: MPL-2.0, see LICENSE for more details.
 """
 
-from dataclasses import dataclass
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any
 from ucapi_framework import BaseConfigManager
 
+_LOG = logging.getLogger(__name__)
+
+
+def env_float(name: str, default: float) -> float:
+    """Read a numeric tuning knob from the environment, falling back on bad values."""
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        _LOG.warning("Ignoring invalid %s=%r", name, os.getenv(name))
+        return default
+
 
 @dataclass
 class HTP1Config:
@@ -16,6 +30,8 @@ class HTP1Config:
     identifier: str
     name: str
     host: str
+    # Macro name -> steps; see intg_monoprice_htp1.macros for the step format.
+    macros: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
 
 
 class HTP1ConfigManager(BaseConfigManager[HTP1Config]):
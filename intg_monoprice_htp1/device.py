@@ -6,18 +6,33 @@ Monoprice HTP-1 device implementation for Unfolded Circle integration.
 """
 
 import asyncio
-import json
 import logging
 import os
+import random
+from collections.abc import Awaitable, Callable, Iterable
+from functools import lru_cache
 from typing import Any
 
-import aiohttp
 import websockets
 from websockets.client import WebSocketClientProtocol
 
 from ucapi_framework import WebSocketDevice, DeviceEvents
-from intg_monoprice_htp1.config import HTP1Config
+from intg_monoprice_htp1 import codec, metrics, profiler
+from intg_monoprice_htp1.commands import HTTP_COMMANDS
+from intg_monoprice_htp1.config import HTP1Config, env_float
 from intg_monoprice_htp1.displayvalues import sound_mode_display_values, sound_mode_native_values
+from intg_monoprice_htp1.http_client import HTTPCommandClient
+from intg_monoprice_htp1.latency import LatencyTracker, command_kind
+from intg_monoprice_htp1.macros import MacroRunner, compile_macros
+from intg_monoprice_htp1.optimistic import OPTIMISTIC_TIMEOUT, OptimisticOverlay
+from intg_monoprice_htp1.outbound import Priority, SendQueue, WriteCoalescer, transaction_priority
+from intg_monoprice_htp1.patch import PatchError, apply_patch, paths_overlap, resolve_pointer
+from intg_monoprice_htp1.ramp import RAMP_RATE, VolumeRamp
+from intg_monoprice_htp1.readiness import Readiness
+from intg_monoprice_htp1.resync import ResyncCoordinator, drifted_roots
+from intg_monoprice_htp1.routing import route_operations
+from intg_monoprice_htp1.snapshot import SnapshotStore
+from intg_monoprice_htp1.state import HTP1State
 
 _LOG = logging.getLogger(__name__)
 
@@ -26,19 +41,148 @@ BEQ_SLOT_START = 0
 BEQ_SLOT_END = 15
 
 
+# msoupdate frames arriving within this window are parsed and pushed once.
+COALESCE_WINDOW = env_float("HTP1_COALESCE_MS", 0) / 1000
+# Verify the mirror against a fresh mso after this long without any msoupdate.
+DRIFT_IDLE_CHECK = env_float("HTP1_DRIFT_IDLE_S", 1800)
+# How long an optimistic write is shown before it is rolled back for lack of an echo.
+OPTIMISTIC_WINDOW = env_float("HTP1_OPTIMISTIC_MS", OPTIMISTIC_TIMEOUT * 1000) / 1000
+# Replace-only changemso transactions issued within this window are sent as one frame.
+WRITE_COALESCE_WINDOW = env_float("HTP1_WRITE_COALESCE_MS", 0) / 1000
+# Rate at which set_volume_level walks toward its target; 0 restores the single clamped jump.
+VOLUME_RAMP_RATE = env_float("HTP1_VOLUME_RAMP_DB_S", RAMP_RATE)
+MAX_VOLUME_JUMP = 5  # dB
+# Send Remote commands that have an exact mso equivalent as changemso; 0 keeps them all on IR.
+ROUTE_MSO = env_float("HTP1_ROUTE_MSO", 1) > 0
+# Reconnect backoff after a dropped connection: doubles from the base up to the cap, with jitter.
+RECONNECT_BASE = env_float("HTP1_RECONNECT_BASE_MS", 500) / 1000
+RECONNECT_MAX = env_float("HTP1_RECONNECT_MAX_S", 30)
+# How long last-known values are shown while the processor cannot be reached.
+STALE_GRACE = env_float("HTP1_STALE_GRACE_S", 120)
+
+# Order in which derivations run on a full parse.
+_DERIVERS = (
+    "_derive_power",
+    "_derive_mute",
+    "_derive_volume",
+    "_derive_shaker",
+    "_derive_source",
+    "_derive_toggles",
+    "_derive_peq",
+    "_derive_sound_mode",
+    "_derive_audio_format",
+    "_derive_dirac",
+    "_derive_video_mode",
+    "_derive_connection",
+)
+
+# mso root -> [(second path segment or None for any, derivations)].
+# Paths not listed here (e.g. /peq/slots/...) do not feed any entity.
+_STATE_DEPENDENCIES: dict[str, list[tuple[str | None, tuple[str, ...]]]] = {
+    "powerIsOn": [(None, ("_derive_power",))],
+    "muted": [(None, ("_derive_mute",))],
+    "volume": [(None, ("_derive_volume",))],
+    "cal": [
+        ("zeroPoint", ("_derive_volume",)),
+        ("vpl", ("_derive_volume",)),
+        ("vph", ("_derive_volume",)),
+        ("diracactive", ("_derive_dirac",)),
+        ("currentdiracslot", ("_derive_dirac",)),
+        ("slots", ("_derive_dirac",)),
+    ],
+    "shaker": [(None, ("_derive_shaker",))],
+    "input": [(None, ("_derive_source",))],
+    "inputs": [(None, ("_derive_source",))],
+    "loudness": [(None, ("_derive_toggles",))],
+    "night": [(None, ("_derive_toggles",))],
+    "peq": [
+        ("peqsw", ("_derive_peq",)),
+        ("beqActive", ("_derive_peq",)),
+    ],
+    "upmix": [(None, ("_derive_sound_mode",))],
+    "status": [(None, ("_derive_audio_format",))],
+    "videostat": [(None, ("_derive_video_mode",))],
+}
+
+
+@lru_cache(maxsize=2048)
+def _derivers_for_path(path: str) -> frozenset[str]:
+    """Return the derivations affected by a change at a JSON-Patch path."""
+    if not path:
+        return frozenset(_DERIVERS)
+    tokens = path[1:].split("/")
+    entries = _STATE_DEPENDENCIES.get(tokens[0])
+    if not entries:
+        return frozenset()
+    names: set[str] = set()
+    for sub, derivers in entries:
+        if sub is None or len(tokens) == 1 or tokens[1] == sub:
+            names.update(derivers)
+    return frozenset(names)
+
+
+_MISSING = object()
+
+
+def _on_off(value: Any) -> str:
+    if isinstance(value, str):
+        return value.capitalize()
+    return "On" if value else "Off"
+
+
 class HTP1Device(WebSocketDevice):
     """Monoprice HTP-1 implementation using WebSocketDevice."""
 
     def __init__(self, device_config: HTP1Config, **kwargs):
-        super().__init__(device_config, reconnect=True, ping_interval=30, **kwargs)
+        # The framework's own reconnect wait is disabled; create_websocket paces retries with jitter.
+        super().__init__(
+            device_config, reconnect=True, reconnect_interval=0, reconnect_max=0, ping_interval=30, **kwargs
+        )
         self._device_config = device_config
         self._state: dict[str, Any] | None = None
+        self.model = HTP1State()
         self._state_ready = asyncio.Event()
+        self._resync = ResyncCoordinator(self.send_message, self.log_id, on_timeout=self._on_snapshot_timeout)
+        self.readiness = Readiness.DISCONNECTED
+        self.state_version = 0
+        self._connected_at: float | None = None
+        self._reconnect_attempts = 0
+        self._retrying = False
+        # The mirror holds last-known values that a fresh mso has not confirmed yet.
+        self.stale = False
+        self._stale_handle: asyncio.TimerHandle | None = None
+        self._stale_expired = False
+        self._verify_reason: str | None = None
+        self._last_update = 0.0
+        self._drift_task: asyncio.Task | None = None
+        self.drift_stats = {"checks": 0, "drifted": 0, "last_drifted_roots": []}
+        self._optimistic = OptimisticOverlay(OPTIMISTIC_WINDOW)
+        self._optimistic_handle: asyncio.TimerHandle | None = None
+        self.latency = LatencyTracker()
+        self.route_stats = {"ws": 0, "ir": 0}
+        self.send_queue = SendQueue(self._write_frame, self.log_id, on_sent=self._record_send_wait)
+        self._writes = WriteCoalescer(self._send_changemso, WRITE_COALESCE_WINDOW)
+        self._ramp = VolumeRamp(
+            self._write_volume,
+            lambda: self.model.volume,
+            lambda: (self.vpl, self.vph),
+            rate=VOLUME_RAMP_RATE if VOLUME_RAMP_RATE > 0 else RAMP_RATE,
+        )
         self._ws: WebSocketClientProtocol | None = None
+        self.http = HTTPCommandClient(device_config.host, self.log_id, device_config.identifier)
+        self._state_waiters: list[tuple[str, Callable[[Any], bool], asyncio.Future]] = []
+        self.macros = MacroRunner(self, compile_macros(device_config.macros))
 
+        self.events.on(DeviceEvents.CONNECTING, self._on_connecting)
         self.events.on(DeviceEvents.CONNECTED, self._on_connected)
         self.events.on(DeviceEvents.DISCONNECTED, self._on_disconnected)
 
+        self._pending_paths: list[str] = []
+        self._pending_messages = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self.coalesce_stats = {"flushes": 0, "messages": 0, "max_merged": 0}
+
+        self._subscribers: list[tuple[frozenset[str] | None, Callable[[], Awaitable[None]]]] = []
         self._sensor_data: dict[str, str] = {}
         self.current_source: str = ""
         self.source_list: list[str] = []
@@ -57,19 +201,85 @@ class HTP1Device(WebSocketDevice):
         self.ss_trim = 0
         self.beq_active: str = ""
 
+        self._snapshots: SnapshotStore | None = None
+        data_path = getattr(self._config_manager, "data_path", None)
+        if data_path:
+            self._snapshots = SnapshotStore(
+                os.path.join(data_path, f"mso_{device_config.identifier}.json"),
+                # Never persist a value the processor has not confirmed.
+                lambda: self._optimistic.confirmed_document(self._state) if self._state_ready.is_set() else None,
+            )
+            self._warm_start()
+
+    def register_metrics(self) -> None:
+        """Bind the per-device gauges to this instance; only for the device the driver runs."""
+        metrics.set_gauge("htp1_connected_seconds", self._connected_seconds, device=self.identifier)
+        metrics.set_gauge("htp1_send_queue_depth", lambda: self.send_queue.depth, device=self.identifier)
+        metrics.set_gauge(
+            "htp1_snapshot_timeout_seconds", lambda: self._resync.timeout.current, device=self.identifier
+        )
+
+    def _warm_start(self) -> None:
+        """Show last-known values from the saved mso until the live one arrives."""
+        snapshot = self._snapshots.load()
+        if snapshot is None:
+            return
+        self._state = snapshot
+        self.stale = True
+        self._parse_state()
+        self._start_stale_grace()
+        _LOG.info("[%s] Warm start from saved mso snapshot", self.log_id)
+
+    async def wait_ready(self, timeout: float) -> bool:
+        """Wait until a live mso has been received; False on timeout."""
+        try:
+            await asyncio.wait_for(self._state_ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    @property
+    def available(self) -> bool:
+        """True when entities have values to show: live, or last-known within the stale grace period."""
+        if self.is_connected:
+            return True
+        return self._state is not None and self._stale_handle is not None and not self._stale_expired
+
+    def _start_stale_grace(self) -> None:
+        """Keep showing last-known values for STALE_GRACE, then report the device unavailable."""
+        self._stop_stale_grace()
+        self._stale_handle = self._loop.call_later(STALE_GRACE, self._expire_stale)
+
+    def _stop_stale_grace(self) -> None:
+        if self._stale_handle is not None:
+            self._stale_handle.cancel()
+            self._stale_handle = None
+        self._stale_expired = False
+
+    def _expire_stale(self) -> None:
+        self._stale_expired = True
+        if not self.is_connected:
+            _LOG.info("[%s] Unreachable for %.0f s, reporting unavailable", self.log_id, STALE_GRACE)
+            self.push_update({"connection"})
+
+    async def _on_connecting(self, identifier: str) -> None:
+        self._set_readiness(Readiness.CONNECTING)
+
     async def _on_connected(self, identifier: str) -> None:
         _LOG.info("[%s] WebSocket connected", self.log_id)
-        self._state = None
+        self._connected_at = self._loop.time()
+        self._reconnect_attempts = 0
+        metrics.inc("htp1_connects", device=self.identifier)
+        # The processor is reachable again; stop failing IR commands fast.
+        self.http.breaker.reset()
         self._state_ready.clear()
-        await asyncio.sleep(0.1)
-        await self.send_message("getmso")
-        try:
-            await asyncio.wait_for(self._state_ready.wait(), timeout=5.0)
-            _LOG.info("[%s] Initial state received", self.log_id)
-            self._parse_state()
-            self.push_update()
-        except asyncio.TimeoutError:
-            _LOG.warning("[%s] Timeout waiting for initial state", self.log_id)
+        self._resync.reset()
+        self._set_readiness(Readiness.AWAITING_SNAPSHOT)
+        # Retried by the coordinator until an mso arrives; see _on_snapshot_timeout.
+        await self._resync.request("connected")
+
+        if DRIFT_IDLE_CHECK > 0 and (self._drift_task is None or self._drift_task.done()):
+            self._drift_task = asyncio.create_task(self._drift_watch())
 
         if os.getenv("INVOCATION_ID"):
             _LOG.info("[%s] Running On Remote", self.log_id)
@@ -79,10 +289,98 @@ class HTP1Device(WebSocketDevice):
 
     async def _on_disconnected(self, identifier: str) -> None:
         _LOG.info("[%s] WebSocket disconnected", self.log_id)
-        self._state = None
+        self._connected_at = None
+        if self._snapshots:
+            self._snapshots.cancel()
+        if self.latency.samples:
+            _LOG.info("[%s] Command latency:\n%s", self.log_id, self.latency.report())
+        self._mark_stale(Readiness.DISCONNECTED)
+        await self.http.close()
+
+    async def connect(self) -> bool:
+        # An explicit connect goes out right away; only retries are paced.
+        self._retrying = False
+        return await super().connect()
+
+    async def _before_connect_attempt(self) -> None:
+        """Keep the mirror across a dropped connection and pace the reconnect."""
+        if self._connected_at is not None:
+            # Still set, so the connection loop is retrying after a loss rather than after disconnect().
+            self._connected_at = None
+            _LOG.info("[%s] Connection lost, keeping last-known state", self.log_id)
+            self._mark_stale(Readiness.CONNECTING)
+        if self._retrying:
+            backoff = min(RECONNECT_BASE * 2 ** self._reconnect_attempts, RECONNECT_MAX)
+            self._reconnect_attempts += 1
+            delay = backoff * random.uniform(0.5, 1.0)
+            _LOG.debug("[%s] Reconnecting in %.1f s", self.log_id, delay)
+            await asyncio.sleep(delay)
+        self._retrying = True
+
+    def _mark_stale(self, readiness: Readiness) -> None:
+        """Drop per-connection work but keep the mirror, so entities hold their values."""
+        self._cancel_flush()
+        self._resync.reset()
+        self._ramp.cancel()
+        self._writes.cancel()
+        self.send_queue.cancel()
+        self.macros.cancel()
+        self.latency.reset()
+        if self._state is not None and len(self._optimistic):
+            # Unconfirmed writes may never have reached the device.
+            self.push_update(self._parse_state(self._optimistic.revert(self._state)))
+        self._clear_optimistic()
+        self._verify_reason = None
+        if self._drift_task:
+            self._drift_task.cancel()
+            self._drift_task = None
         self._state_ready.clear()
-        self._sensor_data = {}
-        self.push_update()
+        self.stale = self._state is not None
+        if readiness is Readiness.DISCONNECTED:
+            # An explicit disconnect hides last-known values right away.
+            self._stop_stale_grace()
+        elif self._stale_handle is None:
+            self._start_stale_grace()
+        self._set_readiness(readiness)
+        if readiness is Readiness.DISCONNECTED:
+            self.push_update({"connection"})
+
+    def _set_readiness(self, readiness: Readiness) -> None:
+        if readiness is not self.readiness:
+            _LOG.info("[%s] Readiness %s -> %s", self.log_id, self.readiness.value, readiness.value)
+            self.readiness = readiness
+        label = self._connection_label()
+        if self._sensor_data.get("connection") != label:
+            self._sensor_data["connection"] = label
+            self.push_update({"connection"})
+
+    def _connection_label(self) -> str:
+        if self.readiness is Readiness.CONNECTING:
+            return "Reconnecting" if self.stale else "Connecting"
+        if self.readiness is Readiness.DEGRADED:
+            return "Degraded"
+        if self.readiness is Readiness.DISCONNECTED:
+            return "Disconnected"
+        return "Connected"
+
+    def _on_snapshot_timeout(self, attempts: int) -> None:
+        if self.is_connected:
+            self._set_readiness(Readiness.DEGRADED)
+
+    async def _ensure_state(self, live: bool = False) -> bool:
+        """
+        Wait for an mso that is already on its way, then report whether there is state to act on.
+
+        With ``live`` a stale mirror (warm start, or kept across a reconnect) does not count.
+        """
+        if not self._state_ready.is_set() and self.readiness is Readiness.AWAITING_SNAPSHOT:
+            await self.wait_ready(self._resync.timeout.current)
+        if live:
+            return self._state_ready.is_set()
+        return self._state is not None
+
+    def _connected_seconds(self) -> float:
+        return self._loop.time() - self._connected_at if self._connected_at is not None else 0.0
 
     @property
     def identifier(self) -> str:
@@ -107,7 +405,24 @@ class HTP1Device(WebSocketDevice):
     def get_sensor_value(self, key: str) -> str:
         return self._sensor_data.get(key, "")
 
+    def subscribe(self, callback: Callable[[], Awaitable[None]], keys: Iterable[str] | None = None) -> None:
+        """Call ``callback`` on updates touching any of ``keys`` (all updates if None)."""
+        self._subscribers.append((frozenset(keys) if keys is not None else None, callback))
+
+    @profiler.profiled
+    @metrics.timed("htp1_push_update_seconds")
+    def push_update(self, changed: Iterable[str] | None = None) -> None:
+        """Wake subscribers interested in ``changed``; None means everything changed."""
+        if changed is not None:
+            changed = set(changed)
+            if not changed:
+                return
+        for keys, callback in self._subscribers:
+            if changed is None or keys is None or not keys.isdisjoint(changed):
+                self._loop.create_task(callback())
+
     async def create_websocket(self) -> WebSocketClientProtocol:
+        await self._before_connect_attempt()
         _LOG.info(
             "[%s] Creating WebSocket connection to %s", self.log_id, self.websocket_url
         )
@@ -135,184 +450,334 @@ class HTP1Device(WebSocketDevice):
             _LOG.error("[%s] Error receiving message: %s", self.log_id, err)
             return None
 
+    @profiler.profiled
     async def handle_message(self, message: str) -> None:
-        if self._state is None:
-            _LOG.info("[%s] First message received, requesting initial state", self.log_id)
-            await self.send_message("getmso")
+        if not self._state_ready.is_set():
+            await self._resync.request("first message")
 
         try:
             if " " not in message:
                 return
 
             cmd, payload = message.split(" ", 1)
-            data = json.loads(payload)
+            data = codec.loads(payload)
+            if metrics.ENABLED:
+                metrics.inc("htp1_messages_received", type=cmd, device=self.identifier)
+                metrics.inc("htp1_bytes_decoded", len(payload), device=self.identifier)
 
             if cmd == "mso":
-                self._state = data
-                self._state_ready.set()
-                _LOG.debug("[%s] Received full state", self.log_id)
-                self._parse_state()
-                self.push_update()
+                self._apply_snapshot(data)
 
             elif cmd == "msoupdate":
-                if not isinstance(data, list):
-                    data = [data]
-
-                for piece in data:
-                    op = piece.get("op")
-                    path = piece.get("path", "")[1:].split("/")
-                    target = self._state
-                    final = path.pop()
-
-                    if op == "remove":
-                        for node in path:
-                            if isinstance(target, list):
-                                node = int(node)
-                            target = target[node]
-                        if isinstance(target, dict):
-                            target.pop(final, None)
-                        elif isinstance(target, list):
-                            del target[int(final)]
-                        continue
-
-                    if op not in ("add", "replace"):
-                        continue
-
-                    for node in path:
-                        if isinstance(target, list):
-                            node = int(node)
-                        target = target[node]
-
-                    value = piece.get("value")
-                    target[final] = value
-
-                self._parse_state()
-                self.push_update()
+                if self._resync.in_flight:
+                    self._resync.buffer(data)
+                    return
+                if self._state is None or not self._state_ready.is_set():
+                    return
+
+                result = apply_patch(self._state, data)
+                self._state = result.document
+                paths = result.paths
+                self._last_update = self._loop.time()
+                if result.applied:
+                    self.state_version += 1
+                    if self.latency.echo(paths, self._last_update):
+                        self._publish_latency()
+                    if len(self._optimistic):
+                        self._optimistic.settle(self._state, paths)
+                    if self._state_waiters:
+                        self._notify_state_waiters(paths)
+                if not result.ok:
+                    _LOG.warning(
+                        "[%s] Patch failed after %d op(s) (%s): %s, resyncing",
+                        self.log_id, result.applied, result.error, result.failed_op,
+                    )
+                    await self._verify_mirror("patch failed")
+
+                if self._snapshots and paths:
+                    self._snapshots.schedule()
+                self._pending_paths.extend(paths)
+                self._pending_messages += 1
+                if COALESCE_WINDOW <= 0:
+                    self._flush_updates()
+                elif self._flush_handle is None:
+                    self._flush_handle = self._loop.call_later(COALESCE_WINDOW, self._flush_updates)
 
         except Exception as err:
             _LOG.error("[%s] Message processing error: %s", self.log_id, err)
 
-    def _parse_state(self) -> None:
+    def _apply_snapshot(self, data: dict[str, Any]) -> None:
+        """Install a full mso and push what changed."""
+        self._cancel_flush()
+        # The socket is ordered, so patches buffered while getmso was in flight
+        # are already part of this reply. Replaying them would repeat appends,
+        # index removes and moves; they only bring the old mirror up to date.
+        buffered = self._resync.complete()
+        reconcile = self._state is not None
+        if self._verify_reason and reconcile:
+            mirror = self._state
+            # Unconfirmed writes are not drift; compare what the device last told us.
+            self._optimistic.revert(mirror)
+            for operations in buffered:
+                mirror = apply_patch(mirror, operations).document
+        self._clear_optimistic()
+        self._state = data
+        if self._verify_reason and reconcile:
+            self._check_drift(mirror, self._state, self._verify_reason)
+        self._verify_reason = None
+        self.stale = False
+        self._stop_stale_grace()
+        self._last_update = self._loop.time()
+        self.state_version += 1
+        self._state_ready.set()
+        self._set_readiness(Readiness.READY)
+        if self._state_waiters:
+            self._notify_state_waiters(None)
+        _LOG.debug("[%s] Received full state (%d patches arrived while in flight)", self.log_id, len(buffered))
+        changed = self._parse_state()
+        # Against a warm-start snapshot or a mirror kept across a reconnect
+        # only the differences need pushing.
+        self.push_update(changed if reconcile else None)
+        if self._snapshots:
+            self._snapshots.schedule()
+
+    def state_value(self, path: str) -> Any:
+        """Value at an mso path in the mirror, or None if absent."""
+        if self._state is None:
+            return None
+        try:
+            return resolve_pointer(self._state, path)
+        except PatchError:
+            return None
+
+    async def wait_for_state(self, path: str, predicate: Callable[[Any], bool], timeout: float) -> bool:
+        """Wait until the device reports a value at ``path`` that satisfies ``predicate``."""
+        if self._state_ready.is_set() and predicate(self.state_value(path)):
+            return True
+        entry = (path, predicate, self._loop.create_future())
+        self._state_waiters.append(entry)
+        try:
+            return await asyncio.wait_for(entry[2], timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._state_waiters.remove(entry)
+
+    def _notify_state_waiters(self, paths: list[str] | None) -> None:
+        for path, predicate, future in self._state_waiters:
+            if future.done() or (paths is not None and not paths_overlap(path, paths)):
+                continue
+            if predicate(self.state_value(path)):
+                future.set_result(True)
+
+    async def _verify_mirror(self, reason: str) -> None:
+        """Fetch a fresh mso and compare it with the mirror before replacing it."""
+        if self._resync.in_flight:
+            return
+        self._verify_reason = reason
+        await self._resync.request(reason)
+
+    def _check_drift(self, mirror: dict[str, Any], snapshot: dict[str, Any], reason: str) -> None:
+        self.drift_stats["checks"] += 1
+        roots = drifted_roots(mirror, snapshot)
+        if roots:
+            self.drift_stats["drifted"] += 1
+            self.drift_stats["last_drifted_roots"] = roots
+            _LOG.warning("[%s] Mirror drift after %s in: %s", self.log_id, reason, ", ".join(roots))
+        else:
+            _LOG.debug("[%s] Mirror verified after %s, no drift", self.log_id, reason)
+
+    async def _drift_watch(self) -> None:
+        """Verify the mirror after long idle periods, when silent divergence is most likely."""
+        while True:
+            await asyncio.sleep(DRIFT_IDLE_CHECK / 4)
+            idle = self._loop.time() - self._last_update
+            if self._state_ready.is_set() and idle >= DRIFT_IDLE_CHECK:
+                await self._verify_mirror(f"{idle:.0f} s idle")
+
+    def _arm_optimistic_expiry(self) -> None:
+        deadline = self._optimistic.next_deadline()
+        if self._optimistic_handle is None and deadline is not None:
+            self._optimistic_handle = self._loop.call_at(deadline, self._expire_optimistic)
+
+    def _expire_optimistic(self) -> None:
+        self._optimistic_handle = None
         if not self._state:
             return
+        paths = self._optimistic.expire(self._state, self._loop.time())
+        if paths:
+            _LOG.warning("[%s] No echo for %s, rolling back", self.log_id, ", ".join(paths))
+            self.push_update(self._parse_state(paths))
+        self._arm_optimistic_expiry()
+
+    def _clear_optimistic(self) -> None:
+        if self._optimistic_handle is not None:
+            self._optimistic_handle.cancel()
+            self._optimistic_handle = None
+        self._optimistic.clear()
+
+    def _flush_updates(self) -> None:
+        """Parse and push everything patched since the last flush."""
+        self._flush_handle = None
+        paths, merged = self._pending_paths, self._pending_messages
+        self._pending_paths, self._pending_messages = [], 0
+        if not merged:
+            return
 
-        self.power = self._state.get("powerIsOn", False)
-        self.muted = self._state.get("muted", False)
+        stats = self.coalesce_stats
+        stats["flushes"] += 1
+        stats["messages"] += merged
+        stats["max_merged"] = max(stats["max_merged"], merged)
+        if merged > 1:
+            _LOG.debug("[%s] Flushing %d coalesced msoupdates", self.log_id, merged)
+
+        self.push_update(self._parse_state(paths))
+
+    def _cancel_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._pending_paths, self._pending_messages = [], 0
+
+    @profiler.profiled
+    @metrics.timed("htp1_parse_state_seconds")
+    def _parse_state(self, paths: Iterable[str] | None = None) -> set[str]:
+        """Refresh the typed model and re-derive entity-facing attributes.
+
+        With ``paths`` (JSON-Patch paths from an ``msoupdate``) only the
+        derivations whose source subtrees were touched are recomputed.
+        Returns the keys whose derived value actually changed.
+        """
+        if not self._state:
+            return set()
 
-        volume = self._state.get("volume", 0)
-        if "cal" in self._state:
-            cal = self._state["cal"]
-            self.zp = cal.get("zeroPoint", 0)
-            self.vpl = cal.get("vpl", -80)
-            self.vph = cal.get("vph", 12)
+        if paths is None:
+            self.model.load(self._state)
+            derivers = _DERIVERS
+        else:
+            paths = list(paths)
+            self.model.refresh(self._state, paths)
+            touched: set[str] = set()
+            for path in paths:
+                touched |= _derivers_for_path(path)
+            if not touched:
+                return set()
+            derivers = tuple(name for name in _DERIVERS if name in touched)
+
+        before = dict(self._sensor_data)
+        power, source_list, slot_names = self.power, self.source_list, self.slot_names
+
+        for name in derivers:
+            getattr(self, name)(self.model)
+
+        changed = {key for key, value in self._sensor_data.items() if before.get(key, _MISSING) != value}
+        if self.power != power:
+            changed.add("power")
+        if self.source_list != source_list:
+            changed.add("source_list")
+        if self.slot_names != slot_names:
+            changed.add("slot_names")
+        return changed
+
+    def _derive_power(self, model: HTP1State) -> None:
+        self.power = model.power
+
+    def _derive_mute(self, model: HTP1State) -> None:
+        self.muted = model.muted
+        self._sensor_data["mute"] = "On" if self.muted else "Off"
+
+    def _derive_volume(self, model: HTP1State) -> None:
+        volume = model.volume
+        if model.cal is not None:
+            self.zp = model.cal.zero_point
+            self.vpl = model.cal.vpl
+            self.vph = model.cal.vph
             volume -= self.zp
         self.volume_db = volume
-
-        if ("shaker" in self._state):
-            shaker = self._state.get("shaker")
-            self.ss_mute = shaker.get("mute", "off")
-            self.ss_preset = shaker.get("activePreset", 0)+1
-            presets = shaker.get("presets")
-            if presets:
-                current_preset = presets.get(str(shaker.get("activePreset")))
-            else:
-                current_preset = None
-            if current_preset:
-                self.ss_trim = current_preset.get("trim", 0)
-            else:
-                self.ss_trim = 0
-
-        input_id = self._state.get("input")
+        self._sensor_data["volume"] = f"{self.volume_db}"
+
+    def _derive_shaker(self, model: HTP1State) -> None:
+        shaker = model.shaker
+        if shaker is not None:
+            self.ss_mute = shaker.mute
+            self.ss_preset = shaker.active_preset + 1
+            current_preset = shaker.current_preset
+            self.ss_trim = current_preset.trim if current_preset else 0
+        self._sensor_data["ss_trim"] = f"{self.ss_trim}"
+        self._sensor_data["ss_mute"] = self.ss_mute.capitalize()
+        self._sensor_data["ss_preset"] = self.ss_preset
+
+    def _derive_source(self, model: HTP1State) -> None:
         source_list = []
         source = ""
-        if "inputs" in self._state:
-            for inp_id, inp_info in self._state["inputs"].items():
-                if inp_info.get("visible"):
-                    source_list.append(inp_info.get("label", inp_id))
-                if inp_id == input_id:
-                    source = inp_info.get("label", inp_id)
+        if model.inputs is not None:
+            for inp_id, inp_info in model.inputs.items():
+                if inp_info.visible:
+                    source_list.append(inp_info.label)
+                if inp_id == model.input:
+                    source = inp_info.label
         self.current_source = source
         self.source_list = source_list
+        self._sensor_data["input"] = source
 
-        loudness_state = self._state.get("loudness", "off")
-        night_mode_state = self._state.get("night", "off")
-        peq_sw = self._state.get("peq", {}).get("peqsw", False)
-        self.beq_active = self._state.get("peq", {}).get("beqActive", "")
+    def _derive_toggles(self, model: HTP1State) -> None:
+        self._sensor_data["loudness"] = _on_off(model.loudness)
+        self._sensor_data["night_mode"] = _on_off(model.night)
 
-        sound_mode = ""
-        if "upmix" in self._state:
-            sound_mode = self._state["upmix"].get("select", "")
+    def _derive_peq(self, model: HTP1State) -> None:
+        peq_sw = model.peq.peqsw if model.peq else False
+        self.beq_active = model.peq.beq_active if model.peq else ""
+        self._sensor_data["peq"] = "On" if peq_sw else "Off"
+        self._sensor_data["beq_active"] = self.beq_active or "None"
+
+    def _derive_sound_mode(self, model: HTP1State) -> None:
+        sound_mode = model.upmix.select if model.upmix else ""
         self.surround_mode = sound_mode
         self.sound_mode_display = sound_mode_display_values.get(sound_mode, sound_mode)
+        self._sensor_data["sound_mode"] = self.sound_mode_display
 
+    def _derive_audio_format(self, model: HTP1State) -> None:
         audio_format = "none"
-        if "status" in self._state:
-            audio_info = self._state["status"]
-            codec = audio_info.get("DECSourceProgram", "")
-            channels = audio_info.get("DECProgramFormat", "")
+        output_audio_format = ""
+        status = model.status
+        if status is not None:
+            codec, channels = status.source_program, status.program_format
             if channels:
                 audio_format = f"{channels} {codec}".strip() if codec else channels
 
-        output_audio_format = ""
-        if "status" in self._state:
-            output_info = self._state["status"]
-            output_codec = output_info.get("SurroundMode", "")
-            output_channels = output_info.get("ENCListeningFormat", "")
+            output_codec, output_channels = status.surround_mode, status.listening_format
             if output_channels:
                 output_audio_format = f"{output_channels} {output_codec}".strip() if output_codec else output_channels
+        self._sensor_data["audio_format"] = audio_format
+        self._sensor_data["output_audio_format"] = output_audio_format
 
+    def _derive_dirac(self, model: HTP1State) -> None:
         dirac_slot_name = "None"
         available_slots = []
-        if "cal" in self._state:
-            cal = self._state["cal"]
-            dirac_status = cal.get("diracactive", False)
-            if dirac_status == "on":
-                slot_idx = cal.get("currentdiracslot", 0)
-                slots = cal.get("slots", [])
-                if slots and slot_idx < len(slots):
-                    dirac_slot_name = slots[slot_idx].get("name", "")
-            elif dirac_status == "bypass":
+        cal = model.cal
+        if cal is not None:
+            if cal.dirac_active == "on":
+                if cal.slots and cal.current_slot < len(cal.slots):
+                    dirac_slot_name = cal.slots[cal.current_slot].name
+            elif cal.dirac_active == "bypass":
                 dirac_slot_name = "Dirac Bypass"
             else:
                 dirac_slot_name = "Dirac Off"
-            for slot in cal.get("slots", []):
-                if slot.get("valid", False):
-                    available_slots.append(slot.get("name", ""))
+            available_slots = [slot.name for slot in cal.slots if slot.valid]
         self.dirac_slot_name = dirac_slot_name
         self.slot_names = available_slots
+        self._sensor_data["dirac_slot"] = dirac_slot_name
 
+    def _derive_video_mode(self, model: HTP1State) -> None:
         video_mode = "-----"
-        if "videostat" in self._state:
-            vi = self._state["videostat"]
-            parts = [vi.get("VideoResolution", "")]
-            if vi.get("HDRstatus"):
-                parts.append(vi["HDRstatus"])
-            if vi.get("VideoColorSpace"):
-                parts.append(vi["VideoColorSpace"])
-            if vi.get("VideoMode"):
-                parts.append(vi["VideoMode"])
-            if vi.get("VideoBitDepth"):
-                parts.append(vi["VideoBitDepth"])
+        vi = model.videostat
+        if vi is not None:
+            parts = (vi.resolution, vi.hdr, vi.color_space, vi.mode, vi.bit_depth)
             video_mode = " ".join(p for p in parts if p) or "-----"
+        self._sensor_data["video_mode"] = video_mode
 
-        self._sensor_data = {
-            "input": source,
-            "volume": f"{self.volume_db}",
-            "mute": "On" if self.muted else "Off",
-            "ss_trim": f"{self.ss_trim}",
-            "ss_mute": self.ss_mute.capitalize(),
-            "ss_preset": self.ss_preset,
-            "loudness": str(loudness_state).capitalize() if isinstance(loudness_state, str) else ("On" if loudness_state else "Off"),
-            "night_mode": str(night_mode_state).capitalize() if isinstance(night_mode_state, str) else ("On" if night_mode_state else "Off"),
-            "peq": "On" if peq_sw else "Off",
-            "sound_mode": self.sound_mode_display,
-            "audio_format": audio_format,
-            "output_audio_format": output_audio_format,
-            "dirac_slot": dirac_slot_name,
-            "video_mode": video_mode,
-            "connection": "Connected" if self.is_connected else "Disconnected",
-            "beq_active": self.beq_active or "None",
-        }
+    def _derive_connection(self, model: HTP1State) -> None:
+        self._sensor_data["connection"] = self._connection_label()
 
     @staticmethod
     async def _prefetch_beq_catalogue() -> None:
@@ -320,7 +785,13 @@ class HTP1Device(WebSocketDevice):
         await prefetch_catalogue()
         # await start_refresh_loop()
 
-    async def send_message(self, message: str) -> bool:
+    async def send_message(self, message: str, priority: Priority = Priority.NORMAL, key: Any = None) -> bool:
+        """Queue a frame for the writer task and wait until it has been sent."""
+        if not self.is_connected:
+            return False
+        return await self.send_queue.submit(message, priority, key)
+
+    async def _write_frame(self, message: str) -> bool:
         try:
             if self._ws and self.is_connected:
                 await self._ws.send(message)
@@ -331,30 +802,85 @@ class HTP1Device(WebSocketDevice):
             _LOG.error("[%s] Send error: %s", self.log_id, err)
             return False
 
-    async def _send_transaction(self, operations: list[dict[str, Any]]) -> bool:
-        payload = json.dumps(operations, separators=(",", ":"))
-        return await self.send_message(f"changemso {payload}")
+    async def _send_transaction(self, operations: list[dict[str, Any]], optimistic: bool = False) -> bool:
+        """Send a changemso; with ``optimistic`` show the new values before the device echoes them."""
+        await self._ensure_state()
+        paths: list[str] = []
+        if (
+            optimistic
+            and OPTIMISTIC_WINDOW > 0
+            and self._state
+            and self._state_ready.is_set()
+            and not self._resync.in_flight
+        ):
+            paths = self._optimistic.apply(self._state, operations, self._loop.time())
+            if paths:
+                self.push_update(self._parse_state(paths))
+                self._arm_optimistic_expiry()
+
+        if WRITE_COALESCE_WINDOW > 0 and self._writes.accepts(operations):
+            sent = await self._writes.submit(operations)
+        else:
+            # Keep ordering: anything still queued goes out first.
+            await self._writes.flush()
+            sent = await self._send_changemso(operations)
+        if not sent and paths and self._state:
+            self.push_update(self._parse_state(self._optimistic.revert(self._state, paths)))
+        return sent
+
+    async def send_transaction(self, operations: list[dict[str, Any]]) -> bool:
+        """Send arbitrary changemso operations, e.g. a macro step."""
+        return await self._send_transaction(operations)
+
+    async def _send_changemso(self, operations: list[dict[str, Any]]) -> bool:
+        payload = codec.dumps(operations)
+        started = self._loop.time()
+        paths = [op.get("path") for op in operations]
+        # A newer write of exactly the same settings replaces one still queued.
+        key = ("changemso", *paths) if WriteCoalescer.accepts(operations) else None
+        sent = await self.send_message(f"changemso {payload}", transaction_priority(operations), key)
+        if sent:
+            self.latency.start([path for path in paths if isinstance(path, str)], started)
+        return sent
+
+    def _record_send_wait(self, priority: Priority, waited: float) -> None:
+        metrics.observe("htp1_send_wait_seconds", waited, priority=priority.name.lower(), device=self.identifier)
+
+    def _publish_latency(self) -> None:
+        self._sensor_data["latency"] = self.latency.summary()
+        self.push_update({"latency"})
+        if self.latency.samples % 100 == 0:
+            _LOG.info("[%s] Command latency:\n%s", self.log_id, self.latency.report())
 
     async def turn_on(self) -> bool:
         _LOG.info("[%s] Turning on", self.log_id)
         return await self._send_transaction([
             {"op": "replace", "path": "/powerIsOn", "value": True}
-        ])
+        ], optimistic=True)
 
     async def turn_off(self) -> bool:
         _LOG.info("[%s] Turning off", self.log_id)
         return await self._send_transaction([
             {"op": "replace", "path": "/powerIsOn", "value": False}
-        ])
+        ], optimistic=True)
 
     async def set_volume(self, volume: int) -> bool:
         _LOG.info("[%s] Setting volume to %d", self.log_id, volume)
+        self._ramp.cancel()
+        return await self._write_volume(volume)
+
+    async def _write_volume(self, volume: int) -> bool:
         return await self._send_transaction([
             {"op": "replace", "path": "/volume", "value": volume}
-        ])
+        ], optimistic=True)
+
+    @property
+    def volume_ramp_target(self) -> int | None:
+        """Target of the volume ramp in progress, if any."""
+        return self._ramp.target
 
     async def set_volume_level(self, level: float) -> bool:
-        if not self._state or "cal" not in self._state:
+        if not await self._ensure_state() or self.model.cal is None:
             return False
 
         span = self.vph - self.vpl
@@ -365,31 +891,35 @@ class HTP1Device(WebSocketDevice):
         target_db = int(round(self.vpl + (level * span)))
         target_db = max(int(self.vpl), min(int(self.vph), target_db))
 
-        current_volume = self._state.get("volume", 0)
+        if VOLUME_RAMP_RATE > 0:
+            _LOG.info("[%s] Ramping volume to %d dB", self.log_id, target_db)
+            self._ramp.retarget(target_db)
+            return True
+
+        current_volume = self.model.volume
         volume_delta = abs(target_db - current_volume)
-        max_safe_jump = 5
 
-        if volume_delta > max_safe_jump:
+        if volume_delta > MAX_VOLUME_JUMP:
             if target_db > current_volume:
-                target_db = current_volume + max_safe_jump
+                target_db = current_volume + MAX_VOLUME_JUMP
             else:
-                target_db = current_volume - max_safe_jump
+                target_db = current_volume - MAX_VOLUME_JUMP
             _LOG.warning("[%s] Volume jump clamped to %d dB", self.log_id, target_db)
 
         return await self.set_volume(target_db)
 
     async def volume_up(self) -> bool:
-        if not self._state:
+        if not await self._ensure_state():
             return False
-        current = self._state.get("volume", 0)
+        current = self._writes.pending_value("/volume", self.model.volume)
         if current >= self.vph:
             return True
         return await self.set_volume(current + 1)
 
     async def volume_down(self) -> bool:
-        if not self._state:
+        if not await self._ensure_state():
             return False
-        current = self._state.get("volume", 0)
+        current = self._writes.pending_value("/volume", self.model.volume)
         limit = self.vpl - self.zp
         if current - self.zp <= limit:
             return True
@@ -399,7 +929,7 @@ class HTP1Device(WebSocketDevice):
         _LOG.info("[%s] Setting mute to %s", self.log_id, muted)
         return await self._send_transaction([
             {"op": "replace", "path": "/muted", "value": muted}
-        ])
+        ], optimistic=True)
 
     async def ss_mute_toggle(self, muted: bool) -> bool:
         _LOG.info("[%s] Setting seat shaker mute to %s", self.log_id, muted)
@@ -410,23 +940,23 @@ class HTP1Device(WebSocketDevice):
 
         return await self._send_transaction([
             {"op": "replace", "path": "/shaker/mute", "value": status}
-        ])
+        ], optimistic=True)
     
     async def set_ss_trim(self, trim: int) -> bool:
         _LOG.info("[%s] Setting seat shaker trim to %d", self.log_id, trim)
         return await self._send_transaction([
             {"op": "replace", "path": "/shaker/trim", "value": trim}
-        ])
+        ], optimistic=True)
 
     async def select_source(self, source: str) -> bool:
         _LOG.info("[%s] Selecting source: %s", self.log_id, source)
-        if not self._state or "inputs" not in self._state:
+        if not await self._ensure_state() or self.model.inputs is None:
             return False
-        for inp_id, inp_info in self._state["inputs"].items():
-            if inp_info.get("label") == source:
+        for inp_id, inp_info in self.model.inputs.items():
+            if inp_info.label == source:
                 return await self._send_transaction([
                     {"op": "replace", "path": "/input", "value": inp_id}
-                ])
+                ], optimistic=True)
         _LOG.warning("[%s] Source not found: %s", self.log_id, source)
         return False
 
@@ -435,15 +965,15 @@ class HTP1Device(WebSocketDevice):
         native = sound_mode_native_values.get(sound_mode, sound_mode)
         return await self._send_transaction([
             {"op": "replace", "path": "/upmix/select", "value": native}
-        ])
+        ], optimistic=True)
     
     async def select_ss_preset(self, preset_index: int) -> bool:
         _LOG.info("[%s] Selecting seat shaker preset: %d", self.log_id, preset_index)
-        if not self._state or "shaker" not in self._state:
+        if not await self._ensure_state() or self.model.shaker is None:
             return False
         return await self._send_transaction([
             {"op": "replace", "path": "/shaker/activePreset", "value": preset_index}
-        ])
+        ], optimistic=True)
 
     async def select_calibration(self, slot_name: str) -> bool:
         _LOG.info("[%s] Selecting calibration: %s", self.log_id, slot_name)
@@ -451,7 +981,7 @@ class HTP1Device(WebSocketDevice):
             return False
         return await self._send_transaction([
             {"op": "replace", "path": "/cal/currentdiracslot", "value": self.slot_names.index(slot_name)}
-        ])
+        ], optimistic=True)
 
     async def send_command(self, command: str) -> bool:
         _LOG.info("[%s] Sending menu command: %s", self.log_id, command)
@@ -464,59 +994,84 @@ class HTP1Device(WebSocketDevice):
             return False
         return await self.send_message(htp1_command)
 
+    async def send_remote_command(self, command: str) -> bool:
+        """Send a Remote command from HTTP_COMMANDS, over the WebSocket when it has an mso equivalent."""
+        if command not in HTTP_COMMANDS:
+            return False
+        equivalent = route_operations(command, self.state_value) if self._state_ready.is_set() else None
+        routed = equivalent is not None and ROUTE_MSO and self.is_connected
+        transport = "ws" if routed else "ir"
+        self.route_stats[transport] += 1
+        _LOG.debug("[%s] %s via %s", self.log_id, command, transport)
+
+        # Time commands with a known effect until the echo on either transport,
+        # so the routing table can be checked against real numbers.
+        kind = ""
+        if equivalent is not None:
+            path, value = equivalent[0]["path"], equivalent[0]["value"]
+            if self.state_value(path) != value:
+                kind = f"{command_kind([path])}/{transport}"
+                self.latency.start([path], self._loop.time(), kind)
+
+        if routed:
+            sent = await self._send_transaction(equivalent, optimistic=True)
+            if sent and kind:
+                # The changemso opened its own probe; time this command once, under the routed kind.
+                self.latency.discard(command_kind([path]))
+        else:
+            sent = await self.send_http_command(HTTP_COMMANDS[command])
+        if not sent and kind:
+            self.latency.discard(kind)
+        return sent
+
     async def send_http_command(self, command: str) -> bool:
         _LOG.info("[%s] Sending http command: %s", self.log_id, command)
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"http://{self.address}/ircmd?code={command}") as response:
-                    return response.status == 200
-        except Exception as err:
-            _LOG.error("[%s] HTTP command error: %s", self.log_id, err)
-            return False
+        started = self._loop.time()
+        ok = await self.http.ircmd(command)
+        if ok:
+            self.latency.record("ir", self._loop.time() - started)
+            self._publish_latency()
+        return ok
 
     def _get_sub_channels(self) -> list[str]:
         if not self._state:
             return ["sub1"]
 
-        peq_location = self._state.get("peq", {}).get("location", "")
-        if peq_location == "pre":
+        peq = self.model.peq
+        if peq is not None and peq.location == "pre":
             return ["sub1"]
 
-        speakers = self._state.get("speakers", {}).get("groups", {})
+        speakers = self.model.speakers
         subs = []
-        for key, val in speakers.items():
-            if key.startswith("sub") and isinstance(val, dict):
-                if val.get("present", False):
-                    subs.append(key)
+        if speakers is not None:
+            subs = [key for key, present in speakers.present.items() if key.startswith("sub") and present]
         return subs or ["sub1"]
 
     def _find_empty_peq_slot(self, start_slot: int = BEQ_SLOT_START, ch: str | None = None) -> int | None:
-        if not self._state:
+        if not self._state or self.model.peq is None:
             return None
-        peq = self._state.get("peq", {})
-        slots = peq.get("slots", [])
+        slots = self.model.peq.slots
 
         for i in range(start_slot, min(BEQ_SLOT_END + 1, len(slots))):
-            channels = slots[i].get("channels", {})
-            ch_data = channels.get(ch, {})
-            if ch_data.get("gaindB", 0) == 0 or ch_data.get("beq"):
+            filt = slots[i].channels.get(ch)
+            if filt is None or filt.gain_db == 0 or filt.beq:
                 return i
         return None
 
     async def clear_beq(self) -> bool:
         """Clear all BEQ-tagged filters from all PEQ slots on all sub channels."""
-        if not self._state:
+        if not await self._ensure_state(live=True):
             return False
         ops: list[dict] = []
-        peq = self._state.get("peq", {})
-        slots = peq.get("slots", [])
+        peq = self.model.peq
+        slots = peq.slots if peq else []
         all_subs = self._get_sub_channels()
 
         for i in range(min(16, len(slots))):
-            channels = slots[i].get("channels", {})
+            channels = slots[i].channels
             for ch in all_subs:
-                ch_data = channels.get(ch, {})
-                if ch_data.get("beq"):
+                filt = channels.get(ch)
+                if filt is not None and filt.beq:
                     ops.extend([
                         {"op": "replace", "path": f"/peq/slots/{i}/channels/{ch}/Fc", "value": 100},
                         {"op": "replace", "path": f"/peq/slots/{i}/channels/{ch}/gaindB", "value": 0},
@@ -525,7 +1080,7 @@ class HTP1Device(WebSocketDevice):
                         {"op": "remove", "path": f"/peq/slots/{i}/channels/{ch}/beq"},
                     ])
 
-        if "beqActive" in peq:
+        if peq is not None and peq.beq_active:
             ops.append({"op": "remove", "path": "/peq/beqActive"})
 
         if ops:
@@ -533,7 +1088,7 @@ class HTP1Device(WebSocketDevice):
         return True
 
     async def load_beq(self, title: str, filters: list[dict]) -> bool:
-        if not self._state:
+        if not await self._ensure_state(live=True):
             return False
 
         await self.clear_beq()
@@ -5,14 +5,27 @@ Monoprice HTP-1 driver for Unfolded Circle Remote.
 :license: MPL-2.0, see LICENSE for more details.
 """
 
+import asyncio
+import logging
+import random
+import time
+
 from ucapi_framework import BaseIntegrationDriver
-from intg_monoprice_htp1.config import HTP1Config
+from intg_monoprice_htp1.config import HTP1Config, env_float
 from intg_monoprice_htp1.device import HTP1Device
 from intg_monoprice_htp1.media_player import HTP1MediaPlayer
 from intg_monoprice_htp1.remote import HTP1Remote
 from intg_monoprice_htp1.sensor import create_sensors
 from intg_monoprice_htp1.selector import create_selects
 
+_LOG = logging.getLogger(__name__)
+
+# Processors brought online at once during startup.
+STARTUP_CONCURRENCY = max(1, int(env_float("HTP1_CONNECT_CONCURRENCY", 4)))
+# Random delay before each startup connection, so processors are not hit in lockstep.
+STARTUP_STAGGER = env_float("HTP1_CONNECT_STAGGER_MS", 250) / 1000
+STARTUP_READY_TIMEOUT = 15.0  # seconds
+
 
 class HTP1Driver(BaseIntegrationDriver[HTP1Device, HTP1Config]):
     """Monoprice HTP-1 integration driver."""
@@ -29,3 +42,63 @@ class HTP1Driver(BaseIntegrationDriver[HTP1Device, HTP1Config]):
             driver_id="monoprice_htp1",
             require_connection_before_registry=True,
         )
+        self._startup_task: asyncio.Task | None = None
+
+    def _add_device_instance(self, device_config: HTP1Config) -> HTP1Device:
+        device = super()._add_device_instance(device_config)
+        # Not in HTP1Device.__init__: the setup flow's probe device shares the identifier.
+        device.register_metrics()
+        return device
+
+    async def register_all_device_instances(self, connect: bool = False) -> None:
+        """
+        Bring all configured processors online concurrently, a bounded number at a time.
+
+        Connecting runs in the background, so startup does not wait for processors that are offline.
+        """
+        if self.config_manager is None:
+            await super().register_all_device_instances(connect)
+            return
+
+        configs = list(self.config_manager.all())
+        if not configs:
+            return
+
+        for device_config in configs:
+            # Entities are registered up front, showing warm-start values until a connection is up.
+            device = self._add_device_instance(device_config)
+            await self.async_register_available_entities(device_config, device)
+        self._startup_task = asyncio.create_task(self._bring_all_online(configs))
+
+    async def _bring_all_online(self, configs: list[HTP1Config]) -> None:
+        semaphore = asyncio.Semaphore(STARTUP_CONCURRENCY)
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(self._bring_online(device_config, semaphore) for device_config in configs)
+        )
+        _LOG.info(
+            "%d/%d device(s) ready in %.1f s (concurrency %d)",
+            sum(results), len(configs), time.monotonic() - started, STARTUP_CONCURRENCY,
+        )
+
+    async def _bring_online(self, device_config: HTP1Config, semaphore: asyncio.Semaphore) -> bool:
+        device = self._add_device_instance(device_config)
+        try:
+            async with semaphore:
+                if STARTUP_STAGGER > 0:
+                    await asyncio.sleep(random.uniform(0, STARTUP_STAGGER))
+                started = time.monotonic()
+                if not await device.connect():
+                    _LOG.error("[%s] Failed to start connecting", device.log_id)
+                    return False
+                # Hold the slot until the mso has arrived; that is the expensive part.
+                ready = await device.wait_ready(STARTUP_READY_TIMEOUT)
+        except Exception:
+            _LOG.exception("[%s] Startup connection failed", device.log_id)
+            return False
+        elapsed = time.monotonic() - started
+        if ready:
+            _LOG.info("[%s] Ready in %.2f s", device.log_id, elapsed)
+        else:
+            _LOG.warning("[%s] Not ready after %.1f s, continuing in background", device.log_id, elapsed)
+        return ready
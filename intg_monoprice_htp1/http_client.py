@@ -0,0 +1,146 @@
+"""
+Pooled HTTP access to the HTP-1's ``/ircmd`` endpoint.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import aiohttp
+
+from intg_monoprice_htp1 import metrics
+
+_LOG = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 2.0  # seconds
+REQUEST_TIMEOUT = 5.0  # seconds, including waiting for a pooled connection
+MAX_CONCURRENT = 4
+KEEPALIVE = 30.0  # seconds an idle connection is kept open
+BREAKER_THRESHOLD = 3  # consecutive failures that open the circuit
+BREAKER_COOLDOWN = 10.0  # seconds before a trial request is let through
+
+
+class CircuitBreaker:
+    """
+    Fail fast while the processor is unreachable.
+
+    After ``threshold`` consecutive failures the circuit opens and requests
+    are refused. Once ``cooldown`` has passed a single trial request is let
+    through; its outcome closes the circuit or opens it again.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self._trial or time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self._trial or time.monotonic() - self.opened_at < self.cooldown:
+            return False
+        self._trial = True
+        return True
+
+    def success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+
+    def failure(self) -> bool:
+        """Count a failure; True if this opened the circuit."""
+        self.failures += 1
+        was_open = self.opened_at is not None
+        if self._trial or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            self._trial = False
+            return not was_open
+        return False
+
+    def abandon(self) -> None:
+        """Give up a trial that ended without an outcome, so a later request can try again."""
+        self._trial = False
+
+    def reset(self) -> None:
+        self.success()
+
+
+class HTTPCommandClient:
+    """One keep-alive session per device, bounded in concurrency and time."""
+
+    def __init__(self, host: str, log_id: str, identifier: str = "", breaker: CircuitBreaker | None = None):
+        self.host = host
+        self._log_id = log_id
+        self._identifier = identifier
+        self.breaker = breaker or CircuitBreaker()
+        self._session: aiohttp.ClientSession | None = None
+        self.stats = {"requests": 0, "ok": 0, "failed": 0, "timeouts": 0, "rejected": 0}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=MAX_CONCURRENT, keepalive_timeout=KEEPALIVE),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, sock_connect=CONNECT_TIMEOUT),
+            )
+        return self._session
+
+    async def ircmd(self, code: str) -> bool:
+        """Send one IR code; False on failure or while the circuit is open."""
+        if not self.breaker.allow():
+            self.stats["rejected"] += 1
+            metrics.inc("htp1_http_requests", outcome="rejected", device=self._identifier)
+            _LOG.debug("[%s] Processor unreachable, not sending %s", self._log_id, code)
+            return False
+
+        self.stats["requests"] += 1
+        started = time.perf_counter()
+        outcome = "failed"
+        try:
+            async with self._get_session().get(f"http://{self.host}/ircmd", params={"code": code}) as response:
+                await response.read()
+                if response.status == 200:
+                    outcome = "ok"
+                else:
+                    _LOG.warning("[%s] ircmd %s returned HTTP %d", self._log_id, code, response.status)
+        except asyncio.TimeoutError:
+            outcome = "timeouts"
+            _LOG.warning("[%s] ircmd %s timed out", self._log_id, code)
+        except aiohttp.ClientError as err:
+            _LOG.warning("[%s] ircmd %s failed: %s", self._log_id, code, err)
+        except BaseException:
+            # Cancelled or unexpected; do not leave the circuit stuck half-open.
+            self.breaker.abandon()
+            raise
+        finally:
+            self.stats[outcome] += 1
+            if metrics.ENABLED:
+                metrics.inc("htp1_http_requests", outcome=outcome, device=self._identifier)
+                metrics.observe("htp1_http_seconds", time.perf_counter() - started, device=self._identifier)
+
+        if outcome == "ok":
+            self.breaker.success()
+            return True
+        if self.breaker.failure():
+            _LOG.warning(
+                "[%s] %d failed ircmd requests, failing fast for %.0f s",
+                self._log_id, self.breaker.failures, self.breaker.cooldown,
+            )
+        return False
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
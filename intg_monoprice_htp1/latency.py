@@ -0,0 +1,155 @@
+"""
+Command round-trip latency tracking for the HTP-1.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass, field
+
+from intg_monoprice_htp1.patch import paths_overlap
+
+# Upper bucket bounds in milliseconds; the last bucket is open-ended.
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+ECHO_TIMEOUT = 10.0  # seconds
+
+# Command type by the first mso root a changemso touches.
+_KINDS = {
+    "volume": "volume",
+    "muted": "mute",
+    "input": "input",
+    "upmix": "upmix",
+    "peq": "beq",
+    "powerIsOn": "power",
+    "shaker": "shaker",
+    "cal": "dirac",
+}
+
+
+def command_kind(paths: list[str]) -> str:
+    """Classify a changemso by the paths it writes."""
+    for path in paths:
+        kind = _KINDS.get(path[1:].split("/", 1)[0])
+        if kind:
+            return kind
+    return "other"
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Bucketed latency samples in milliseconds."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(BUCKETS_MS) + 1))
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th sample (max for the open bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return float(BUCKETS_MS[i]) if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+@dataclass(slots=True)
+class _Probe:
+    kind: str
+    paths: tuple[str, ...]
+    started: float
+
+
+class LatencyTracker:
+    """
+    Time each changemso until the first msoupdate touching one of its paths,
+    and each IR request until its HTTP response, per command type. Routed
+    Remote commands are also timed until the echo, per transport.
+    """
+
+    def __init__(self, timeout: float = ECHO_TIMEOUT):
+        self._timeout = timeout
+        self._probes: list[_Probe] = []
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.timeouts = 0
+
+    def start(self, paths: list[str], now: float, kind: str | None = None) -> None:
+        """Open a probe answered by the next msoupdate for ``paths``; ``kind`` overrides the type."""
+        if paths:
+            self._probes.append(_Probe(kind or command_kind(paths), tuple(paths), now))
+
+    def discard(self, kind: str) -> None:
+        """Drop the newest open probe of ``kind``, e.g. when its command was not sent."""
+        for i in range(len(self._probes) - 1, -1, -1):
+            if self._probes[i].kind == kind:
+                del self._probes[i]
+                return
+
+    def record(self, kind: str, seconds: float) -> None:
+        histogram = self.histograms.get(kind)
+        if histogram is None:
+            histogram = self.histograms[kind] = LatencyHistogram()
+        histogram.observe(seconds * 1000)
+
+    def echo(self, paths: list[str], now: float) -> bool:
+        """Close probes answered by an msoupdate for ``paths``; True if any were."""
+        if not self._probes:
+            return False
+        answered = False
+        remaining = []
+        for probe in self._probes:
+            if now - probe.started > self._timeout:
+                self.timeouts += 1
+            elif any(paths_overlap(p, paths) for p in probe.paths):
+                self.record(probe.kind, now - probe.started)
+                answered = True
+            else:
+                remaining.append(probe)
+        self._probes = remaining
+        return answered
+
+    def reset(self) -> None:
+        """Forget outstanding probes; collected histograms are kept."""
+        self._probes.clear()
+
+    @property
+    def samples(self) -> int:
+        return sum(h.count for h in self.histograms.values())
+
+    def summary(self) -> str:
+        """Median round trip per command type, e.g. ``volume 40 ms, input 120 ms``."""
+        return ", ".join(
+            f"{kind} {h.quantile(0.5):.0f} ms" for kind, h in sorted(self.histograms.items())
+        )
+
+    def report(self) -> str:
+        """Multi-line dump of every histogram for the log."""
+        lines = [f"echo timeouts: {self.timeouts}"]
+        for kind, h in sorted(self.histograms.items()):
+            buckets = " ".join(
+                f"<={bound}:{n}" for bound, n in zip(BUCKETS_MS, h.counts) if n
+            )
+            if h.counts[-1]:
+                buckets += f" >{BUCKETS_MS[-1]}:{h.counts[-1]}"
+            lines.append(
+                f"{kind}: n={h.count} mean={h.mean_ms:.1f} p50={h.quantile(0.5):.0f} "
+                f"p95={h.quantile(0.95):.0f} max={h.max_ms:.1f} ms [{buckets}]"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,245 @@
+"""
+User-defined command sequences for the HTP-1.
+
+Macros are stored in the device configuration as lists of steps::
+
+    "macros": {
+        "Movie Night": [
+            {"ir": "Dirac On"},
+            {"mso": [{"op": "replace", "path": "/input", "value": "h1"}]},
+            {"wait": "/input", "equals": "h1", "timeout": 5},
+            {"ir": "Mode Dolby Sur"},
+            {"delay": 0.5},
+            {"ir": "7887"}
+        ]
+    }
+
+``ir`` takes a Remote command name or a raw code, ``mso`` a changemso
+transaction and ``delay`` seconds. Named commands with an mso equivalent go
+over the WebSocket like the Remote's own buttons. Consecutive ``ir`` steps
+are sent together; any other step, e.g. ``{"delay": 0}``, keeps the ones
+around it in order. ``wait`` holds the macro until the mso
+value at a path equals ``equals`` or, without it, until the value differs
+from what it was before the previous step ran. A wait that times out stops
+the macro.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Collection, Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from intg_monoprice_htp1.commands import HTTP_COMMANDS
+from intg_monoprice_htp1.http_client import MAX_CONCURRENT
+from intg_monoprice_htp1.remote import SIMPLE_COMMANDS
+
+if TYPE_CHECKING:
+    from intg_monoprice_htp1.device import HTP1Device
+
+_LOG = logging.getLogger(__name__)
+
+WAIT_TIMEOUT = 10.0  # seconds
+MAX_DELAY = 60.0  # seconds
+MAX_QUEUED = 4
+
+_MISSING = object()
+
+
+class MacroError(ValueError):
+    """A macro definition that cannot be run."""
+
+
+@dataclass(slots=True)
+class MacroStep:
+    kind: str  # "ir", "mso", "delay" or "wait"
+    code: str = ""
+    command: str = ""  # Remote command name behind ``code``, if it has one
+    operations: list[dict[str, Any]] = field(default_factory=list)
+    seconds: float = 0.0
+    path: str = ""
+    value: Any = _MISSING
+
+
+def _parse_step(step: Any, ir_codes: Mapping[str, str]) -> MacroStep:
+    if not isinstance(step, dict) or len(step.keys() & {"ir", "mso", "delay", "wait"}) != 1:
+        raise MacroError(f"expected one of ir, mso, delay or wait in {step!r}")
+
+    if "ir" in step:
+        code = str(step["ir"])
+        if code in ir_codes:
+            return MacroStep("ir", code=ir_codes[code], command=code)
+        return MacroStep("ir", code=code)
+
+    if "mso" in step:
+        operations = step["mso"]
+        if (
+            not isinstance(operations, list)
+            or not operations
+            or not all(isinstance(op, dict) and isinstance(op.get("path"), str) for op in operations)
+        ):
+            raise MacroError(f"mso needs a list of JSON-Patch operations, got {operations!r}")
+        return MacroStep("mso", operations=operations)
+
+    if "delay" in step:
+        seconds = step["delay"]
+        if not isinstance(seconds, (int, float)) or not 0 <= seconds <= MAX_DELAY:
+            raise MacroError(f"delay must be 0-{MAX_DELAY:.0f} seconds, got {seconds!r}")
+        return MacroStep("delay", seconds=float(seconds))
+
+    path = step["wait"]
+    if not isinstance(path, str) or not path.startswith("/"):
+        raise MacroError(f"wait needs an mso path such as /input, got {path!r}")
+    timeout = step.get("timeout", WAIT_TIMEOUT)
+    if not isinstance(timeout, (int, float)) or not 0 < timeout <= MAX_DELAY:
+        raise MacroError(f"wait timeout must be 0-{MAX_DELAY:.0f} seconds, got {timeout!r}")
+    return MacroStep("wait", path=path, seconds=float(timeout), value=step.get("equals", _MISSING))
+
+
+def compile_macros(
+    definitions: Mapping[str, Any],
+    ir_codes: Mapping[str, str] = HTTP_COMMANDS,
+    reserved: Collection[str] = SIMPLE_COMMANDS,
+) -> dict[str, list[MacroStep]]:
+    """Validate macro definitions; invalid ones are logged and left out."""
+    macros = {}
+    for name, steps in definitions.items():
+        try:
+            if name in reserved or name in ir_codes:
+                raise MacroError("name is already a Remote command")
+            if not isinstance(steps, list) or not steps:
+                raise MacroError("expected a non-empty list of steps")
+            macros[name] = [_parse_step(step, ir_codes) for step in steps]
+        except MacroError as err:
+            _LOG.error("Ignoring macro %r: %s", name, err)
+    return macros
+
+
+class MacroRunner:
+    """
+    Run a device's macros one at a time, in the order they were triggered.
+
+    Steps go out over the device's existing transports: IR codes over its
+    pooled HTTP session and mso changes over the WebSocket, so a sequence
+    costs no connection setup between steps. A run of IR steps is sent
+    concurrently, up to the size of the HTTP pool.
+    """
+
+    def __init__(self, device: HTP1Device, macros: dict[str, list[MacroStep]]):
+        self._device = device
+        self._macros = macros
+        self._queue: deque[str] = deque()
+        self._worker: asyncio.Task | None = None
+        self.stats = {"runs": 0, "completed": 0, "failed": 0}
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._macros)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._macros
+
+    def run(self, name: str) -> bool:
+        """Schedule a macro; False if it is unknown or too many are waiting."""
+        if name not in self._macros:
+            return False
+        if len(self._queue) >= MAX_QUEUED:
+            _LOG.warning("[%s] %d macros already waiting, ignoring %s", self._device.log_id, MAX_QUEUED, name)
+            return False
+        self._queue.append(name)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain())
+        return True
+
+    async def _drain(self) -> None:
+        while self._queue:
+            name = self._queue.popleft()
+            self.stats["runs"] += 1
+            started = time.monotonic()
+            try:
+                ok = await self._execute(name, self._macros[name])
+            except Exception as err:
+                _LOG.error("[%s] Macro %s failed: %s", self._device.log_id, name, err)
+                ok = False
+            self.stats["completed" if ok else "failed"] += 1
+            _LOG.info(
+                "[%s] Macro %s %s in %.2f s",
+                self._device.log_id, name, "completed" if ok else "stopped", time.monotonic() - started,
+            )
+
+    async def _execute(self, name: str, steps: list[MacroStep]) -> bool:
+        device = self._device
+        index = 0
+        while index < len(steps):
+            step = steps[index]
+            end = index + 1
+            if step.kind == "ir":
+                while end < len(steps) and steps[end].kind == "ir":
+                    end += 1
+
+            # A wait for "any change" compares against the value before the steps it follows.
+            following = steps[end] if end < len(steps) else None
+            if following is not None and following.kind == "wait" and following.value is _MISSING:
+                baseline = device.state_value(following.path)
+
+            failed_at = index
+            if step.kind == "ir":
+                results = await self._send_ir(steps[index:end])
+                ok = all(results)
+                if not ok:
+                    failed_at = index + results.index(False)
+            elif step.kind == "mso":
+                ok = await device.send_transaction(step.operations)
+            elif step.kind == "delay":
+                await asyncio.sleep(step.seconds)
+                ok = True
+            elif step.value is _MISSING:
+                start = baseline if index else device.state_value(step.path)
+                ok = await device.wait_for_state(step.path, lambda value: value != start, step.seconds)
+            else:
+                expected = step.value
+                ok = await device.wait_for_state(step.path, lambda value: value == expected, step.seconds)
+
+            if not ok:
+                _LOG.warning(
+                    "[%s] Macro %s stopped at step %d (%s)", device.log_id, name, failed_at + 1, steps[failed_at].kind
+                )
+                return False
+            index = end
+        return True
+
+    async def _send_ir(self, steps: list[MacroStep]) -> list[bool]:
+        """Send consecutive IR steps together, no more at once than the HTTP pool holds."""
+        if len(steps) == 1:
+            return [await self._send_ir_step(steps[0])]
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+
+        async def send(step: MacroStep) -> bool:
+            async with semaphore:
+                return await self._send_ir_step(step)
+
+        results = await asyncio.gather(*(send(step) for step in steps), return_exceptions=True)
+        for step, result in zip(steps, results):
+            if isinstance(result, Exception):
+                _LOG.error("[%s] Macro step %s failed: %s", self._device.log_id, step.command or step.code, result)
+        return [result is True for result in results]
+
+    async def _send_ir_step(self, step: MacroStep) -> bool:
+        if step.command:
+            # Same path as the Remote's button, including mso routing.
+            return await self._device.send_remote_command(step.command)
+        return await self._device.send_http_command(step.code)
+
+    def cancel(self) -> None:
+        """Drop waiting macros and stop the one running, e.g. when the connection goes away."""
+        self._queue.clear()
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+        self._worker = None
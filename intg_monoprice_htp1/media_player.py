@@ -14,13 +14,15 @@ from ucapi import StatusCodes
 from ucapi.media_player import BrowseOptions, BrowseResults, SearchOptions, SearchResults
 from ucapi.media_player import (
     Attributes,
-    Commands,
     DeviceClasses,
     Features,
     States,
 )
 from ucapi_framework import MediaPlayerEntity
 
+from intg_monoprice_htp1 import metrics
+from intg_monoprice_htp1.commands import MEDIA_PLAYER, REGISTRY
+
 if TYPE_CHECKING:
     from intg_monoprice_htp1.config import HTP1Config
     from intg_monoprice_htp1.device import HTP1Device
@@ -41,6 +43,8 @@ FEATURES = [
     Features.SEARCH_MEDIA,
 ]
 
+STATE_KEYS = ("power", "volume", "mute", "input", "source_list", "sound_mode", "connection")
+
 
 class HTP1MediaPlayer(MediaPlayerEntity):
     """Media player entity for Monoprice HTP-1."""
@@ -64,10 +68,11 @@ class HTP1MediaPlayer(MediaPlayerEntity):
             device_class=DeviceClasses.RECEIVER,
             cmd_handler=self._handle_command,
         )
-        self.subscribe_to_device(device)
+        device.subscribe(self.sync_state, STATE_KEYS)
 
+    @metrics.counted("htp1_entity_updates", entity="media_player")
     async def sync_state(self):
-        if not self._device.is_connected:
+        if not self._device.available:
             self.update({Attributes.STATE: States.UNAVAILABLE})
             return
 
@@ -102,82 +107,4 @@ class HTP1MediaPlayer(MediaPlayerEntity):
         self, entity: Any, cmd_id: str, params: dict[str, Any] | None
     ) -> StatusCodes:
         _LOG.info("[%s] Command: %s %s", self.id, cmd_id, params or "")
-
-        try:
-            if cmd_id == Commands.ON:
-                return StatusCodes.OK if await self._device.turn_on() else StatusCodes.SERVER_ERROR
-
-            if cmd_id == Commands.OFF:
-                return StatusCodes.OK if await self._device.turn_off() else StatusCodes.SERVER_ERROR
-
-            if cmd_id == Commands.VOLUME:
-                if params and "volume" in params:
-                    success = await self._device.set_volume_level(float(params["volume"]) / 100.0)
-                    return StatusCodes.OK if success else StatusCodes.SERVER_ERROR
-                return StatusCodes.BAD_REQUEST
-
-            if cmd_id == Commands.VOLUME_UP:
-                return StatusCodes.OK if await self._device.volume_up() else StatusCodes.SERVER_ERROR
-
-            if cmd_id == Commands.VOLUME_DOWN:
-                return StatusCodes.OK if await self._device.volume_down() else StatusCodes.SERVER_ERROR
-
-            if cmd_id == Commands.MUTE_TOGGLE:
-                return StatusCodes.OK if await self._device.mute_toggle(not self._device.muted) else StatusCodes.SERVER_ERROR
-
-            if cmd_id == Commands.MUTE:
-                return StatusCodes.OK if await self._device.mute_toggle(True) else StatusCodes.SERVER_ERROR
-
-            if cmd_id == Commands.UNMUTE:
-                return StatusCodes.OK if await self._device.mute_toggle(False) else StatusCodes.SERVER_ERROR
-
-            if cmd_id == Commands.SELECT_SOURCE:
-                if params and "source" in params:
-                    return StatusCodes.OK if await self._device.select_source(params["source"]) else StatusCodes.SERVER_ERROR
-                return StatusCodes.BAD_REQUEST
-
-            if cmd_id == Commands.SELECT_SOUND_MODE:
-                if params and "mode" in params:
-                    return StatusCodes.OK if await self._device.select_sound_mode(params["mode"]) else StatusCodes.SERVER_ERROR
-                return StatusCodes.BAD_REQUEST
-
-            if cmd_id == Commands.PLAY_MEDIA:
-                return await self._handle_play_media(params)
-
-            return StatusCodes.NOT_IMPLEMENTED
-
-        except Exception as err:
-            _LOG.error("[%s] Command error: %s", self.id, err)
-            return StatusCodes.SERVER_ERROR
-
-    async def _handle_play_media(self, params: dict[str, Any] | None) -> StatusCodes:
-        if not params:
-            return StatusCodes.BAD_REQUEST
-
-        media_id = params.get("media_id", "")
-        if not media_id:
-            return StatusCodes.BAD_REQUEST
-
-        if media_id == "beq:clear":
-            success = await self._device.clear_beq()
-            return StatusCodes.OK if success else StatusCodes.SERVER_ERROR
-        
-        if media_id == "beq:reload":
-            success = await self.clear_cache()
-            return StatusCodes.OK if success else StatusCodes.SERVER_ERROR
-
-        if media_id.startswith("beq:"):
-            from intg_monoprice_htp1.browser import get_beq_entry
-            key = media_id[4:]
-            entry = get_beq_entry(key)
-            if not entry:
-                _LOG.error("[%s] BEQ entry not found for key: %s", self.id, key)
-                return StatusCodes.BAD_REQUEST
-            title = entry.get("underlying", "Unknown")
-            filters = entry.get("filters", [])
-            if not filters:
-                return StatusCodes.BAD_REQUEST
-            success = await self._device.load_beq(title, filters)
-            return StatusCodes.OK if success else StatusCodes.SERVER_ERROR
-
-        return StatusCodes.NOT_IMPLEMENTED
+        return await REGISTRY.dispatch(MEDIA_PLAYER, cmd_id, self._device, params)
@@ -0,0 +1,184 @@
+"""
+Optional OpenMetrics endpoint for integration internals.
+
+Enabled by setting ``HTP1_METRICS_PORT``. When it is unset the helpers below
+return immediately and the decorators hand back the undecorated function.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+from intg_monoprice_htp1.config import env_float
+
+_LOG = logging.getLogger(__name__)
+
+METRICS_PORT = int(env_float("HTP1_METRICS_PORT", 0))
+ENABLED = METRICS_PORT > 0
+
+Labels = tuple[tuple[str, str], ...]
+
+# name -> (type, help)
+_FAMILIES: dict[str, tuple[str, str]] = {
+    "htp1_messages_received": ("counter", "WebSocket messages received, by message type"),
+    "htp1_bytes_decoded": ("counter", "Payload bytes decoded from WebSocket messages"),
+    "htp1_parse_state_seconds": ("summary", "Time spent deriving entity state from the mso"),
+    "htp1_push_update_seconds": ("summary", "Time spent dispatching updates to subscribers"),
+    "htp1_entity_updates": ("counter", "Entity state syncs emitted, by entity type"),
+    "htp1_connects": ("counter", "WebSocket connections established"),
+    "htp1_connected_seconds": ("gauge", "Seconds since the current connection was established"),
+    "htp1_snapshot_timeout_seconds": ("gauge", "Current getmso timeout, adapted to observed snapshot latency"),
+    "htp1_send_queue_depth": ("gauge", "Frames waiting for the outbound writer"),
+    "htp1_send_wait_seconds": ("summary", "Time frames spent queued before being written, by priority"),
+    "htp1_http_requests": ("counter", "ircmd requests, by outcome (ok, failed, timeouts, rejected while unreachable)"),
+    "htp1_http_seconds": ("summary", "ircmd request time"),
+    "htp1_commands": ("counter", "Entity commands dispatched, by group, command and status"),
+    "htp1_command_seconds": ("summary", "Entity command handling time, by group and command"),
+    "htp1_beq_fetch_seconds": ("summary", "BEQ catalogue download and decode time"),
+    "htp1_beq_catalogue_entries": ("gauge", "Entries in the cached BEQ catalogue"),
+    "htp1_search_seconds": ("summary", "BEQ catalogue search time"),
+}
+
+_counters: dict[tuple[str, Labels], float] = {}
+_gauges: dict[tuple[str, Labels], float | Callable[[], float]] = {}
+_summaries: dict[tuple[str, Labels], list[float]] = {}
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, value: float = 1, **labels: Any) -> None:
+    if not ENABLED:
+        return
+    key = (name, _labels(labels))
+    _counters[key] = _counters.get(key, 0) + value
+
+
+def set_gauge(name: str, value: float | Callable[[], float], **labels: Any) -> None:
+    """Set a gauge to a value, or to a callable evaluated at scrape time."""
+    if not ENABLED:
+        return
+    _gauges[(name, _labels(labels))] = value
+
+
+def observe(name: str, seconds: float, **labels: Any) -> None:
+    if not ENABLED:
+        return
+    key = (name, _labels(labels))
+    summary = _summaries.get(key)
+    if summary is None:
+        _summaries[key] = [1, seconds]
+    else:
+        summary[0] += 1
+        summary[1] += seconds
+
+
+def timed(name: str, **labels: Any) -> Callable:
+    """Record call durations of a sync or async function; a no-op when disabled."""
+
+    def decorator(func: Callable) -> Callable:
+        if not ENABLED:
+            return func
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    observe(name, time.perf_counter() - started, **labels)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - started, **labels)
+
+        return wrapper
+
+    return decorator
+
+
+def counted(name: str, **labels: Any) -> Callable:
+    """Count calls of an async function; a no-op when disabled."""
+
+    def decorator(func: Callable) -> Callable:
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            inc(name, **labels)
+            return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+def render() -> str:
+    """Render all metrics in the OpenMetrics text format."""
+    samples: dict[str, list[str]] = {}
+    for (name, labels), value in _counters.items():
+        samples.setdefault(name, []).append(f"{name}_total{_format_labels(labels)} {value}")
+    for (name, labels), value in _gauges.items():
+        try:
+            current = value() if callable(value) else value
+        except Exception as err:
+            _LOG.debug("Gauge %s failed: %s", name, err)
+            continue
+        samples.setdefault(name, []).append(f"{name}{_format_labels(labels)} {current}")
+    for (name, labels), (count, total) in _summaries.items():
+        lines = samples.setdefault(name, [])
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+
+    out = []
+    for name in sorted(samples):
+        kind, help_text = _FAMILIES.get(name, ("unknown", ""))
+        out.append(f"# TYPE {name} {kind}")
+        if help_text:
+            out.append(f"# HELP {name} {help_text}")
+        out.extend(samples[name])
+    out.append("# EOF")
+    return "\n".join(out) + "\n"
+
+
+async def start_server(port: int = METRICS_PORT) -> Any:
+    """Serve ``/metrics`` on ``port``; returns the aiohttp runner."""
+    from aiohttp import web
+
+    async def handle(_request: web.Request) -> web.Response:
+        return web.Response(
+            text=render(),
+            headers={"Content-Type": "application/openmetrics-text; version=1.0.0; charset=utf-8"},
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, port=port).start()
+    _LOG.info("Metrics endpoint listening on port %d", port)
+    return runner
@@ -0,0 +1,134 @@
+"""
+Optimistic mso writes, confirmed or rolled back by the device's echo.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from intg_monoprice_htp1.patch import PatchError, apply_patch, paths_overlap, resolve_pointer
+
+_LOG = logging.getLogger(__name__)
+
+OPTIMISTIC_TIMEOUT = 2.0  # seconds
+
+
+@dataclass(slots=True)
+class PendingWrite:
+    """Values written to one path that the device has not echoed yet."""
+
+    previous: Any
+    expected: list[Any] = field(default_factory=list)
+    deadline: float = 0.0
+
+
+class OptimisticOverlay:
+    """
+    Track ``changemso`` replace operations applied to the mirror ahead of the echo.
+
+    The mirror shows the requested value immediately. An ``msoupdate`` for the
+    same path confirms it; a different value from the device wins. If nothing
+    arrives before the deadline, the last confirmed value is restored.
+    """
+
+    def __init__(self, timeout: float = OPTIMISTIC_TIMEOUT):
+        self.timeout = timeout
+        self._pending: dict[str, PendingWrite] = {}
+        self.confirmed = 0
+        self.superseded = 0
+        self.rolled_back = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def apply(self, doc: dict[str, Any], operations: list[dict[str, Any]], now: float) -> list[str]:
+        """Apply the replace operations to ``doc`` and return the paths written."""
+        paths = []
+        for piece in operations:
+            path = piece.get("path")
+            if piece.get("op") != "replace" or not isinstance(path, str) or not path:
+                continue
+            try:
+                previous = resolve_pointer(doc, path)
+            except PatchError:
+                # Nothing to roll back to; wait for the device instead.
+                continue
+            if not apply_patch(doc, [piece]).ok:
+                continue
+            pending = self._pending.get(path)
+            if pending is None:
+                pending = self._pending[path] = PendingWrite(previous)
+            pending.expected.append(piece.get("value"))
+            pending.deadline = now + self.timeout
+            paths.append(path)
+        return paths
+
+    def settle(self, doc: dict[str, Any], echoed: list[str]) -> list[str]:
+        """
+        Reconcile pending writes with paths the device just patched in ``doc``.
+
+        Returns paths whose value was put back to a newer optimistic write.
+        """
+        if not self._pending or not echoed:
+            return []
+        restored = []
+        for path in [p for p in self._pending if paths_overlap(p, echoed)]:
+            pending = self._pending[path]
+            try:
+                actual = resolve_pointer(doc, path)
+            except PatchError:
+                del self._pending[path]
+                continue
+            if actual not in pending.expected:
+                # The device decided otherwise (or someone else changed it).
+                self.superseded += 1
+                del self._pending[path]
+                continue
+            self.confirmed += 1
+            del pending.expected[: pending.expected.index(actual) + 1]
+            if not pending.expected:
+                del self._pending[path]
+                continue
+            # An older write was echoed; keep showing the newest one.
+            pending.previous = actual
+            apply_patch(doc, [{"op": "replace", "path": path, "value": pending.expected[-1]}])
+            restored.append(path)
+        return restored
+
+    def expire(self, doc: dict[str, Any], now: float) -> list[str]:
+        """Roll back writes whose echo is overdue and return their paths."""
+        expired = [path for path, pending in self._pending.items() if pending.deadline <= now]
+        for path in expired:
+            self.rolled_back += 1
+            pending = self._pending.pop(path)
+            apply_patch(doc, [{"op": "replace", "path": path, "value": pending.previous}])
+        return expired
+
+    def revert(self, doc: dict[str, Any], paths: list[str] | None = None) -> list[str]:
+        """Restore confirmed values in ``doc`` for ``paths`` (all pending if None) and forget them."""
+        reverted = list(self._pending) if paths is None else [p for p in paths if p in self._pending]
+        for path in reverted:
+            pending = self._pending.pop(path)
+            apply_patch(doc, [{"op": "replace", "path": path, "value": pending.previous}])
+        return reverted
+
+    def confirmed_document(self, doc: dict[str, Any]) -> dict[str, Any]:
+        """Return ``doc`` as the device last reported it, copied only if writes are pending."""
+        if not self._pending:
+            return doc
+        doc = copy.deepcopy(doc)
+        for path, pending in self._pending.items():
+            apply_patch(doc, [{"op": "replace", "path": path, "value": pending.previous}])
+        return doc
+
+    def next_deadline(self) -> float | None:
+        return min((p.deadline for p in self._pending.values()), default=None)
+
+    def clear(self) -> None:
+        self._pending.clear()
@@ -0,0 +1,246 @@
+"""
+Outbound changemso handling for the HTP-1.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any
+
+_LOG = logging.getLogger(__name__)
+
+_MISSING = object()
+
+SEND_TIMEOUT = 5.0  # seconds
+MAX_QUEUE_DEPTH = 64
+
+# mso roots whose writes go ahead of everything else.
+_CONTROL_ROOTS = frozenset({"powerIsOn", "muted", "volume"})
+
+
+class Priority(IntEnum):
+    """Send order for queued frames; lower goes first."""
+
+    CONTROL = 0  # power, mute, volume
+    NORMAL = 1  # other settings, getmso, menu commands
+    BULK = 2  # PEQ and BEQ filter writes
+
+
+def transaction_priority(operations: list[dict[str, Any]]) -> Priority:
+    """Classify a changemso by the most urgent path it writes."""
+    priority = Priority.BULK if operations else Priority.NORMAL
+    for op in operations:
+        path = op.get("path")
+        if not isinstance(path, str):
+            continue
+        root = path[1:].split("/", 1)[0]
+        if root in _CONTROL_ROOTS:
+            return Priority.CONTROL
+        if root != "peq":
+            priority = Priority.NORMAL
+    return priority
+
+
+@dataclass(slots=True)
+class _Queued:
+    frame: str
+    priority: Priority
+    key: Hashable | None
+    enqueued: float
+    waiters: list[asyncio.Future] = field(default_factory=list)
+
+
+class SendQueue:
+    """
+    Per-device outbound frames, written one at a time by a single writer task.
+
+    Frames go out by priority, then in submission order. A frame submitted
+    with the ``key`` of one still waiting replaces it in place, and both
+    callers get the result. When ``max_depth`` frames are waiting, the newest
+    frame of the lowest priority is dropped to make room for a more urgent
+    one; otherwise the new frame is refused. Each write is bounded by
+    ``timeout``.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[bool]],
+        log_id: str,
+        max_depth: int = MAX_QUEUE_DEPTH,
+        timeout: float = SEND_TIMEOUT,
+        on_sent: Callable[[Priority, float], None] | None = None,
+    ):
+        self._send = send
+        self._log_id = log_id
+        self.max_depth = max_depth
+        self.timeout = timeout
+        self._on_sent = on_sent
+        self._heap: list[tuple[int, int, _Queued]] = []
+        self._keyed: dict[Hashable, _Queued] = {}
+        self._seq = itertools.count()
+        self._writer: asyncio.Task | None = None
+        self.stats = {"sent": 0, "failed": 0, "merged": 0, "dropped": 0, "timeouts": 0, "max_depth": 0}
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._heap)
+
+    async def submit(self, frame: str, priority: Priority = Priority.NORMAL, key: Hashable | None = None) -> bool:
+        """Queue ``frame`` and wait until it has been written; False if dropped, refused or failed."""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+
+        queued = self._keyed.get(key) if key is not None else None
+        if queued is not None:
+            queued.frame = frame
+            queued.waiters.append(waiter)
+            self.stats["merged"] += 1
+        else:
+            if len(self._heap) >= self.max_depth and not self._make_room(priority):
+                self.stats["dropped"] += 1
+                _LOG.warning("[%s] Send queue full, refusing %s frame", self._log_id, priority.name.lower())
+                return False
+            queued = _Queued(frame, priority, key, time.monotonic(), [waiter])
+            heapq.heappush(self._heap, (priority, next(self._seq), queued))
+            if key is not None:
+                self._keyed[key] = queued
+            self.stats["max_depth"] = max(self.stats["max_depth"], len(self._heap))
+
+        if self._writer is None or self._writer.done():
+            self._writer = loop.create_task(self._drain())
+        return await waiter
+
+    def _make_room(self, priority: Priority) -> bool:
+        victim = max(self._heap, default=None)
+        if victim is None or victim[0] <= priority:
+            return False
+        self._heap.remove(victim)
+        heapq.heapify(self._heap)
+        self._forget(victim[2])
+        self.stats["dropped"] += 1
+        _LOG.warning("[%s] Send queue full, dropped a queued %s frame", self._log_id, victim[2].priority.name.lower())
+        self._resolve(victim[2], False)
+        return True
+
+    async def _drain(self) -> None:
+        while self._heap:
+            _, _, queued = heapq.heappop(self._heap)
+            self._forget(queued)
+            waited = time.monotonic() - queued.enqueued
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            if self._on_sent:
+                self._on_sent(queued.priority, waited)
+            sent = False
+            try:
+                sent = await asyncio.wait_for(self._send(queued.frame), self.timeout)
+            except asyncio.TimeoutError:
+                self.stats["timeouts"] += 1
+                _LOG.warning("[%s] Send timed out after %.1f s", self._log_id, self.timeout)
+            finally:
+                self.stats["sent" if sent else "failed"] += 1
+                self._resolve(queued, sent)
+
+    def _forget(self, queued: _Queued) -> None:
+        if queued.key is not None and self._keyed.get(queued.key) is queued:
+            del self._keyed[queued.key]
+
+    @staticmethod
+    def _resolve(queued: _Queued, result: bool) -> None:
+        for waiter in queued.waiters:
+            if not waiter.done():
+                waiter.set_result(result)
+
+    def cancel(self) -> None:
+        """Fail everything still queued, e.g. when the connection goes away."""
+        heap, self._heap = self._heap, []
+        self._keyed.clear()
+        for _, _, queued in heap:
+            self._resolve(queued, False)
+
+
+class WriteCoalescer:
+    """
+    Merge replace-only transactions issued within a short window into one changemso.
+
+    Repeated replaces of the same path collapse to the last value, so a burst
+    of presses sends the final target once. Every caller waits for the merged
+    frame and gets its send result.
+    """
+
+    def __init__(self, send: Callable[[list[dict[str, Any]]], Awaitable[bool]], window: float):
+        self._send = send
+        self.window = window
+        self._ops: dict[str, dict[str, Any]] = {}
+        self._waiters: list[asyncio.Future] = []
+        self._handle: asyncio.TimerHandle | None = None
+        self.stats = {"frames": 0, "ops_in": 0, "ops_out": 0}
+
+    @staticmethod
+    def accepts(operations: list[dict[str, Any]]) -> bool:
+        return bool(operations) and all(
+            op.get("op") == "replace" and isinstance(op.get("path"), str) for op in operations
+        )
+
+    def pending_value(self, path: str, default: Any = None) -> Any:
+        """Value queued for ``path`` but not sent yet, else ``default``."""
+        op = self._ops.get(path, _MISSING)
+        return default if op is _MISSING else op.get("value")
+
+    async def submit(self, operations: list[dict[str, Any]]) -> bool:
+        for op in operations:
+            # Re-insert so the merged frame keeps the order of the latest writes.
+            self._ops.pop(op["path"], None)
+            self._ops[op["path"]] = op
+        self.stats["ops_in"] += len(operations)
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        if self._handle is None:
+            self._handle = loop.call_later(self.window, lambda: asyncio.create_task(self.flush()))
+        return await waiter
+
+    async def flush(self) -> bool:
+        """Send whatever is queued now; True if there was nothing to send."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if not self._ops:
+            return True
+        operations, waiters = list(self._ops.values()), self._waiters
+        self._ops, self._waiters = {}, []
+        self.stats["frames"] += 1
+        self.stats["ops_out"] += len(operations)
+        if len(waiters) > 1:
+            _LOG.debug("Merged %d transactions into one changemso", len(waiters))
+        sent = False
+        try:
+            sent = await self._send(operations)
+        finally:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(sent)
+        return sent
+
+    def cancel(self) -> None:
+        """Drop queued writes, e.g. when the connection goes away."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(False)
+        self._ops, self._waiters = {}, []
@@ -0,0 +1,207 @@
+"""
+RFC 6902 JSON Patch engine for the Monoprice HTP-1 mso mirror.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+# A compiled path token: the raw key plus its array index, if it is one.
+# "-" (append) is represented by the index APPEND.
+Token = tuple[str, int | None]
+APPEND = -1
+
+
+class PatchError(Exception):
+    """Raised internally when a single patch operation cannot be applied."""
+
+
+@dataclass(slots=True)
+class PatchResult:
+    """Outcome of applying a patch document to the mirror."""
+
+    document: Any
+    applied: int = 0
+    paths: list[str] = field(default_factory=list)
+    error: str | None = None
+    failed_op: dict[str, Any] | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@lru_cache(maxsize=4096)
+def compile_path(path: str) -> tuple[Token, ...]:
+    """Split a JSON Pointer into unescaped tokens with pre-resolved array indices."""
+    if path == "":
+        return ()
+    if not path.startswith("/"):
+        raise PatchError(f"Invalid JSON pointer: {path!r}")
+    tokens = []
+    for raw in path[1:].split("/"):
+        key = raw.replace("~1", "/").replace("~0", "~")
+        if key == "-":
+            index = APPEND
+        elif key.isascii() and key.isdigit() and (key == "0" or not key.startswith("0")):
+            index = int(key)
+        else:
+            index = None
+        tokens.append((key, index))
+    return tuple(tokens)
+
+
+def _resolve(doc: Any, tokens: tuple[Token, ...]) -> Any:
+    node = doc
+    for key, index in tokens:
+        if isinstance(node, dict):
+            if key not in node:
+                raise PatchError(f"Member {key!r} not found")
+            node = node[key]
+        elif isinstance(node, list):
+            if index is None or index == APPEND or index >= len(node):
+                raise PatchError(f"Index {key!r} out of range")
+            node = node[index]
+        else:
+            raise PatchError(f"Cannot traverse into {type(node).__name__} at {key!r}")
+    return node
+
+
+def resolve_pointer(doc: Any, path: str) -> Any:
+    """Return the value at a JSON Pointer, raising PatchError if it does not exist."""
+    return _resolve(doc, compile_path(path))
+
+
+def paths_overlap(path: str, others: list[str]) -> bool:
+    """True if ``path`` equals, contains or lies under any of ``others``."""
+    return any(o == path or path.startswith(o + "/") or o.startswith(path + "/") for o in others)
+
+
+def _add(doc: Any, tokens: tuple[Token, ...], value: Any) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1])
+    key, index = tokens[-1]
+    if isinstance(parent, dict):
+        parent[key] = value
+    elif isinstance(parent, list):
+        if index == APPEND:
+            parent.append(value)
+        elif index is None or index > len(parent):
+            raise PatchError(f"Index {key!r} out of range")
+        else:
+            parent.insert(index, value)
+    else:
+        raise PatchError(f"Cannot add to {type(parent).__name__}")
+    return doc
+
+
+def _remove(doc: Any, tokens: tuple[Token, ...]) -> Any:
+    if not tokens:
+        raise PatchError("Cannot remove the document root")
+    parent = _resolve(doc, tokens[:-1])
+    key, index = tokens[-1]
+    if isinstance(parent, dict):
+        if key not in parent:
+            raise PatchError(f"Member {key!r} not found")
+        return parent.pop(key)
+    if isinstance(parent, list):
+        if index is None or index == APPEND or index >= len(parent):
+            raise PatchError(f"Index {key!r} out of range")
+        return parent.pop(index)
+    raise PatchError(f"Cannot remove from {type(parent).__name__}")
+
+
+def _replace(doc: Any, tokens: tuple[Token, ...], value: Any) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1])
+    key, index = tokens[-1]
+    if isinstance(parent, dict):
+        # The processor is authoritative; a replace on a member we have not
+        # seen yet still describes the device state, so accept it.
+        parent[key] = value
+    elif isinstance(parent, list):
+        if index is None or index == APPEND or index >= len(parent):
+            raise PatchError(f"Index {key!r} out of range")
+        parent[index] = value
+    else:
+        raise PatchError(f"Cannot replace in {type(parent).__name__}")
+    return doc
+
+
+def _apply_op(doc: Any, piece: dict[str, Any], paths: list[str]) -> Any:
+    op = piece.get("op")
+    path = piece.get("path")
+    if not isinstance(path, str):
+        raise PatchError("Missing path")
+    tokens = compile_path(path)
+
+    if op == "replace":
+        paths.append(path)
+        return _replace(doc, tokens, piece.get("value"))
+
+    if op == "add":
+        paths.append(path)
+        return _add(doc, tokens, piece.get("value"))
+
+    if op == "remove":
+        paths.append(path)
+        _remove(doc, tokens)
+        return doc
+
+    if op == "test":
+        if _resolve(doc, tokens) != piece.get("value"):
+            raise PatchError(f"Test failed at {path}")
+        return doc
+
+    if op in ("move", "copy"):
+        source = piece.get("from")
+        if not isinstance(source, str):
+            raise PatchError(f"Missing from for {op}")
+        source_tokens = compile_path(source)
+        if op == "move":
+            if source == path:
+                return doc
+            if path.startswith(source + "/"):
+                raise PatchError(f"Cannot move {source} into its own child")
+            value = _remove(doc, source_tokens)
+            paths.append(source)
+        else:
+            value = copy.deepcopy(_resolve(doc, source_tokens))
+        paths.append(path)
+        return _add(doc, tokens, value)
+
+    raise PatchError(f"Unknown op {op!r}")
+
+
+def apply_patch(doc: Any, operations: list[dict[str, Any]] | dict[str, Any]) -> PatchResult:
+    """
+    Apply JSON Patch operations to ``doc`` in place.
+
+    Application stops at the first failing operation. Operations before it
+    remain applied, so a failed result means the mirror needs a resync.
+    """
+    if isinstance(operations, dict):
+        operations = [operations]
+
+    result = PatchResult(document=doc)
+    for piece in operations:
+        try:
+            result.document = _apply_op(result.document, piece, result.paths)
+        except PatchError as err:
+            result.error = str(err)
+            result.failed_op = piece
+            break
+        except (AttributeError, TypeError) as err:
+            result.error = f"Malformed operation: {err}"
+            result.failed_op = piece
+            break
+        result.applied += 1
+    return result
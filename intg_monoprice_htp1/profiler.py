@@ -0,0 +1,147 @@
+"""
+Opt-in cProfile sampling of the integration's hot paths.
+
+Set ``HTP1_PROFILE=1`` to profile calls wrapped with :func:`profiled`. Top-N
+reports are written to ``<config dir>/profiles`` every
+``HTP1_PROFILE_INTERVAL_S`` seconds and on ``SIGUSR1``. When disabled the
+decorator returns the undecorated function.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import functools
+import inspect
+import io
+import logging
+import os
+import pstats
+import signal
+import time
+from collections.abc import Callable
+
+from intg_monoprice_htp1.config import env_float
+
+_LOG = logging.getLogger(__name__)
+
+ENABLED = os.getenv("HTP1_PROFILE", "").lower() in ("1", "true", "yes", "on")
+INTERVAL = env_float("HTP1_PROFILE_INTERVAL_S", 300)
+TOP_N = int(env_float("HTP1_PROFILE_TOP", 30))
+KEEP_REPORTS = 12
+
+_profile = cProfile.Profile()
+_depth = 0
+_calls = 0
+_report_dir: str | None = None
+_task: asyncio.Task | None = None
+
+
+def _enter() -> None:
+    global _depth, _calls
+    _calls += 1
+    _depth += 1
+    if _depth == 1:
+        _profile.enable()
+
+
+def _exit() -> None:
+    global _depth
+    _depth -= 1
+    if _depth == 0:
+        _profile.disable()
+
+
+def profiled(func: Callable) -> Callable:
+    """
+    Profile calls to ``func`` while profiling is enabled.
+
+    Coroutines are profiled until they return, so time other tasks spend
+    running while one is suspended is attributed to the report as well.
+    """
+    if not ENABLED:
+        return func
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            _enter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _exit()
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _enter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _exit()
+
+    return wrapper
+
+
+def write_report(reason: str = "interval") -> str | None:
+    """Write the top functions collected so far, then start a fresh profile."""
+    global _profile, _calls
+    if not _report_dir or not _calls:
+        return None
+    if _depth:
+        _profile.disable()
+
+    stream = io.StringIO()
+    stream.write(f"# {_calls} profiled calls, report on {reason}\n")
+    stats = pstats.Stats(_profile, stream=stream)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_N)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(TOP_N)
+
+    path = os.path.join(_report_dir, time.strftime("htp1-profile-%Y%m%d-%H%M%S.txt"))
+    try:
+        os.makedirs(_report_dir, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(stream.getvalue())
+        _prune()
+        _LOG.info("Wrote profile report %s (%d calls)", path, _calls)
+    except OSError as err:
+        _LOG.warning("Could not write profile report %s: %s", path, err)
+        path = None
+
+    _profile, _calls = cProfile.Profile(), 0
+    if _depth:
+        _profile.enable()
+    return path
+
+
+def _prune() -> None:
+    reports = sorted(f for f in os.listdir(_report_dir) if f.startswith("htp1-profile-"))
+    for name in reports[:-KEEP_REPORTS]:
+        os.remove(os.path.join(_report_dir, name))
+
+
+async def _rotate() -> None:
+    while True:
+        await asyncio.sleep(INTERVAL)
+        write_report()
+
+
+def start(config_dir: str) -> None:
+    """Begin periodic reports into ``config_dir``; a no-op unless enabled."""
+    global _report_dir, _task
+    if not ENABLED:
+        return
+    _report_dir = os.path.join(config_dir, "profiles")
+    loop = asyncio.get_running_loop()
+    if INTERVAL > 0:
+        _task = loop.create_task(_rotate())
+    try:
+        loop.add_signal_handler(signal.SIGUSR1, write_report, "SIGUSR1")
+    except (AttributeError, NotImplementedError, RuntimeError):
+        # No SIGUSR1 (Windows) or not on the main thread.
+        pass
+    _LOG.info("Profiling enabled, reports every %.0f s in %s", INTERVAL, _report_dir)
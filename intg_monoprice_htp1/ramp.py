@@ -0,0 +1,80 @@
+"""
+Stepped volume ramps for the HTP-1.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+_LOG = logging.getLogger(__name__)
+
+RAMP_RATE = 20.0  # dB per second
+RAMP_STEP = 1  # dB
+
+
+class VolumeRamp:
+    """
+    Walk the volume toward a target in fixed steps at a bounded rate.
+
+    A single task runs per device. A new target while it runs retargets the
+    ramp from where it currently is instead of queueing another one.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[int], Awaitable[bool]],
+        current: Callable[[], int | float],
+        limits: Callable[[], tuple[int | float, int | float]],
+        rate: float = RAMP_RATE,
+        step: int = RAMP_STEP,
+    ):
+        self._send = send
+        self._current = current
+        self._limits = limits
+        self.rate = rate
+        self.step = step
+        self.target: int | None = None
+        self.position: int | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def retarget(self, target: int) -> None:
+        self.target = target
+        if not self.active:
+            self.position = int(self._current())
+            self._task = asyncio.create_task(self._run())
+
+    def cancel(self) -> None:
+        if self.active and self._task is not asyncio.current_task():
+            self._task.cancel()
+        self._task = None
+        self.target = None
+
+    async def _run(self) -> None:
+        interval = self.step / self.rate
+        try:
+            while self.target is not None:
+                low, high = self._limits()
+                target = int(max(low, min(high, self.target)))
+                delta = target - self.position
+                if delta == 0:
+                    break
+                position = self.position + max(-self.step, min(self.step, delta))
+                if not await self._send(position):
+                    _LOG.warning("Volume ramp stopped at %d dB: send failed", self.position)
+                    break
+                self.position = position
+                await asyncio.sleep(interval)
+        finally:
+            # A cancelled ramp may unwind after a new one has started; leave that one alone.
+            if self._task is asyncio.current_task():
+                self.target = None
+                self._task = None
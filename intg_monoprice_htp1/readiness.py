@@ -0,0 +1,71 @@
+"""
+Connection readiness of an HTP-1 and the adaptive getmso timeout.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+
+SNAPSHOT_TIMEOUT = 5.0  # seconds, until a snapshot has been timed
+MIN_SNAPSHOT_TIMEOUT = 1.0  # seconds
+MAX_SNAPSHOT_TIMEOUT = 20.0  # seconds
+
+
+class Readiness(str, Enum):
+    """Where a device is on the way from a socket to a usable mso mirror."""
+
+    DISCONNECTED = "disconnected"
+    CONNECTING = "connecting"
+    AWAITING_SNAPSHOT = "awaiting_snapshot"
+    READY = "ready"
+    # Connected, but the requested mso is overdue; retries continue in the background.
+    DEGRADED = "degraded"
+
+
+class SnapshotTimeout:
+    """
+    getmso timeout derived from observed snapshot round trips.
+
+    Uses the smoothed mean and deviation estimator TCP uses for its
+    retransmission timer. Each timeout doubles the value until a new sample
+    arrives; only replies to a first attempt are sampled, since a late reply
+    to a retried request cannot be attributed to either send.
+    """
+
+    def __init__(
+        self,
+        initial: float = SNAPSHOT_TIMEOUT,
+        minimum: float = MIN_SNAPSHOT_TIMEOUT,
+        maximum: float = MAX_SNAPSHOT_TIMEOUT,
+    ):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.mean: float | None = None
+        self.deviation = 0.0
+        self.samples = 0
+        self._scale = 1
+
+    @property
+    def current(self) -> float:
+        if self.mean is None:
+            base = self.initial
+        else:
+            base = max(self.minimum, self.mean + 4 * self.deviation)
+        return min(base * self._scale, self.maximum)
+
+    def observe(self, seconds: float) -> None:
+        if self.mean is None:
+            self.mean, self.deviation = seconds, seconds / 2
+        else:
+            self.deviation = 0.75 * self.deviation + 0.25 * abs(self.mean - seconds)
+            self.mean = 0.875 * self.mean + 0.125 * seconds
+        self.samples += 1
+        self._scale = 1
+
+    def expired(self) -> None:
+        if self.current < self.maximum:
+            self._scale *= 2
@@ -15,6 +15,9 @@ from ucapi.ui import Buttons
 from ucapi.remote import Attributes, Commands, Features, States
 from ucapi_framework import RemoteEntity
 
+from intg_monoprice_htp1 import metrics
+from intg_monoprice_htp1.commands import REGISTRY, REMOTE, SEND
+
 if TYPE_CHECKING:
     from intg_monoprice_htp1.config import HTP1Config
     from intg_monoprice_htp1.device import HTP1Device
@@ -118,96 +121,6 @@ SIMPLE_COMMANDS = [
     "Seat Shaker Trim -1",
 ]
 
-HTTP_COMMANDS = {
-    "VOLUME_DOWN": "09f6",
-    "Mute Toggle": "0af5",
-    "VOLUME_UP": "0bf4",
-    "Mode None": "1be4",
-    "Mode Dolby Sur": "1ce3",
-    "Mode Neural-X": "1de2",
-    "Mode Native": "1ee1",
-    "Mode Auro": "1fe0",
-    "Night Toggle": "40bf",
-    "Dialog Up": "41be",
-    "Dialog Down": "42bd",
-    "Dirac Toggle": "47b8",
-    "Loudness Toggle": "5aa5",
-    "User Input 1": "609f",
-    "User Input 2": "619e",
-    "User Input 3": "629d",
-    "User Input 4": "639c",
-    "User Input 5": "649b",
-    "User Input 6": "659a",
-    "User Input 7": "6699",
-    "User Input 8": "6798",
-    "User Input 9": "6897",
-    "Last Input": "44bb",
-    "BT Pair": "59a6",
-    "HDMI+": "4db2",
-    "SPDIF+": "4eb1",
-    "Analog+": "4fb0",
-    "Stream+": "50af",
-    "Red": "51ae",
-    "Green": "52ad",
-    "Yellow": "53ac",
-    "Blue": "54ab",
-    "A": "55aa",
-    "B": "56a9",
-    "C": "57a8",
-    "D": "58a7",
-    "Preset 1": "03fc",
-    "Preset 2": "04fb",
-    "Preset 3": "05fa",
-    "Preset 4": "06f9",
-    "Info": "43bc",
-    "Dim": "45ba",
-    "Mute On": "4bb4",
-    "Mute Off": "4cb3",
-    "Loud On": "3ac5",
-    "Loud Off": "3bc4",
-    "Night On": "3cc3",
-    "Night Off": "3dc2",
-    "Dirac On": "3ec1",
-    "Dirac Off": "3fc0",
-    "In USB": "2dd2",
-    "In AES": "5ba4",
-    "TV Input": "0ef1",
-    "In HDMI 1": "0ff0",
-    "In HDMI 2": "10ef",
-    "In HDMI 3": "11ee",
-    "In HDMI 4": "12ed",
-    "In HDMI 5": "13ec",
-    "In HDMI 6": "14eb",
-    "In HDMI 7": "15ea",
-    "In HDMI 8": "17e8",
-    "In Bluetooth": "46b9",
-    "In Analog 1": "27d8",
-    "In Analog 2": "28d7",
-    "In Optical 1": "29d6",
-    "In Optical 2": "2ad5",
-    "In Optical 3": "49b6",
-    "In Coaxial 1": "2bd4",
-    "In Coaxial 2": "2cd3",
-    "In Coaxial 3": "48b7",
-    "In Roon": "4ab5",
-    "Tone control Toggle": "708f",
-    "PEQ Toggle": "718e",
-    "Tone control Bass +1": "728d",
-    "Tone control Bass -1": "738c",
-    "Tone control Treble +1": "748b",
-    "Tone control Treble -1": "758a",
-    "Lipsync +1": "7689",
-    "Lipsync -1": "7788",
-    "Dirac Live filter 1": "7887",
-    "Dirac Live filter 2": "7986",
-    "Dirac Live filter 3": "7a85",
-    "Dirac Live filter 4": "7b84",
-    "Dirac Live filter 5": "7c83",
-    "Dirac Live filter 6": "7d82",
-    "Loudness level +1": "7e81",
-    "Loudness level -1": "7f80",
-}
-
 UI_PAGES = [
     {
         "page_id": "main",
@@ -289,15 +202,16 @@ class HTP1Remote(RemoteEntity):
             f"{device_config.name} Remote",
             [Features.TOGGLE],
             {Attributes.STATE: States.UNKNOWN},
-            simple_commands=SIMPLE_COMMANDS,
+            simple_commands=[*SIMPLE_COMMANDS, *device.macros.names],
             button_mapping=BUTTON_MAPPING,
             ui_pages=UI_PAGES,
             cmd_handler=self._handle_command,
         )
-        self.subscribe_to_device(device)
+        device.subscribe(self.sync_state, ("power", "connection"))
 
+    @metrics.counted("htp1_entity_updates", entity="remote")
     async def sync_state(self):
-        if not self._device.is_connected:
+        if not self._device.available:
             self.update({Attributes.STATE: States.UNAVAILABLE})
             return
         state = States.ON if self._device.power else States.OFF
@@ -308,60 +222,11 @@ class HTP1Remote(RemoteEntity):
     ) -> StatusCodes:
         _LOG.info("[%s] Remote command: %s %s", self.id, cmd_id, params or "")
 
-        try:
-            if cmd_id == "POWER":
-                if self._device.power:
-                    success = await self._device.turn_off()
-                else:
-                    success = await self._device.turn_on()
-                return StatusCodes.OK if success else StatusCodes.SERVER_ERROR
-
-            if cmd_id == "VOLUME_UP":
-                return StatusCodes.OK if await self._device.volume_up() else StatusCodes.SERVER_ERROR
-
-            if cmd_id == "VOLUME_DOWN":
-                return StatusCodes.OK if await self._device.volume_down() else StatusCodes.SERVER_ERROR
-
-            if cmd_id == "MUTE":
-                success = await self._device.mute_toggle(not self._device.muted)
-                return StatusCodes.OK if success else StatusCodes.SERVER_ERROR
-            
-            if cmd_id == Commands.SEND_CMD:
-                command = params.get("command", "") if params else ""
-
-                http_cmd = HTTP_COMMANDS.get(command)
-                if http_cmd:
-                    success = await self._device.send_http_command(http_cmd)
-                    return StatusCodes.OK if success else StatusCodes.SERVER_ERROR
-                else:
-                    if command == "Seat Shaker Mute Toggle":
-                        success = await self._device.ss_mute_toggle(not self._device.muted)
-                        return StatusCodes.OK if success else StatusCodes.SERVER_ERROR
-            
-                    if command == "Seat Shaker Trim +1":
-                        new_trim = self._device.ss_trim + 1
-                        success = await self._device.set_ss_trim(new_trim)
-                        return StatusCodes.OK if success else StatusCodes.SERVER_ERROR
-
-                    if command == "Seat Shaker Trim -1":
-                        new_trim = self._device.ss_trim - 1
-                        success = await self._device.set_ss_trim(new_trim)
-                        return StatusCodes.OK if success else StatusCodes.SERVER_ERROR
-            
-                    if command.startswith("Seat Shaker Preset "):
-                        preset_num_str = command.replace("Seat Shaker Preset ", "")
-                        if preset_num_str.isdigit():
-                            preset_index = int(preset_num_str) - 1
-                            success = await self._device.select_ss_preset(preset_index)
-                            return StatusCodes.OK if success else StatusCodes.SERVER_ERROR
-                        else:
-                            return StatusCodes.BAD_REQUEST
-
-                    success = await self._device.send_command(command)
-                    return StatusCodes.OK if success else StatusCodes.SERVER_ERROR
-
-            return StatusCodes.NOT_IMPLEMENTED
+        if cmd_id != Commands.SEND_CMD:
+            return await REGISTRY.dispatch(REMOTE, cmd_id, self._device, params)
 
-        except Exception as err:
-            _LOG.error("[%s] Remote command error: %s", self.id, err)
-            return StatusCodes.SERVER_ERROR
+        command = params.get("command", "") if params else ""
+        if command in self._device.macros:
+            # Macros can take seconds; report once it is scheduled.
+            return StatusCodes.OK if self._device.macros.run(command) else StatusCodes.SERVICE_UNAVAILABLE
+        return await REGISTRY.dispatch(SEND, command, self._device, None)
@@ -0,0 +1,124 @@
+"""
+Single-flight getmso coordination for the HTP-1 mso mirror.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from intg_monoprice_htp1.readiness import SnapshotTimeout
+
+_LOG = logging.getLogger(__name__)
+
+BACKOFF_BASE = 1.0  # seconds
+BACKOFF_MAX = 30.0  # seconds
+MAX_BUFFERED = 1000
+
+
+class ResyncCoordinator:
+    """
+    Allow at most one outstanding ``getmso`` per device.
+
+    Patches that arrive while a snapshot is outstanding are buffered and
+    handed back once it lands. The snapshot already includes them; they
+    bring the previous mirror up to date for the drift check. A snapshot that does not arrive
+    within the adaptive timeout is re-requested with exponential backoff,
+    and ``on_timeout`` is told how many attempts have gone unanswered.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[bool]],
+        log_id: str,
+        timeout: SnapshotTimeout | None = None,
+        on_timeout: Callable[[int], None] | None = None,
+    ):
+        self._send = send
+        self._log_id = log_id
+        self.timeout = timeout or SnapshotTimeout()
+        self._on_timeout = on_timeout
+        self._sent_at = 0.0
+        self._buffer: deque[list[dict[str, Any]]] = deque(maxlen=MAX_BUFFERED)
+        self._watchdog: asyncio.Task | None = None
+        self._in_flight = False
+        self._reason = ""
+        self.failures = 0
+        self.requests = 0
+        self.dropped = 0
+
+    @property
+    def in_flight(self) -> bool:
+        return self._in_flight
+
+    async def request(self, reason: str) -> None:
+        """Request a full snapshot unless one is already on its way."""
+        if self._in_flight:
+            return
+        self._in_flight = True
+        self._reason = reason
+        self.requests += 1
+        _LOG.debug("[%s] Requesting mso (%s)", self._log_id, reason)
+        self._sent_at = time.monotonic()
+        self._watchdog = asyncio.create_task(self._watch(await self._send("getmso")))
+
+    def buffer(self, operations: list[dict[str, Any]]) -> None:
+        """Hold a patch until the outstanding snapshot arrives."""
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append(operations)
+
+    def complete(self) -> list[list[dict[str, Any]]]:
+        """Mark the snapshot as received and return the patches buffered meanwhile."""
+        self._cancel_watchdog()
+        if self._in_flight and not self.failures:
+            self.timeout.observe(time.monotonic() - self._sent_at)
+        self._in_flight = False
+        self.failures = 0
+        buffered = list(self._buffer)
+        self._buffer.clear()
+        return buffered
+
+    def reset(self) -> None:
+        """Forget any outstanding request, e.g. when the connection drops."""
+        self._cancel_watchdog()
+        self._in_flight = False
+        self._buffer.clear()
+
+    def _cancel_watchdog(self) -> None:
+        if self._watchdog and not self._watchdog.done() and self._watchdog is not asyncio.current_task():
+            self._watchdog.cancel()
+        self._watchdog = None
+
+    async def _watch(self, sent: bool) -> None:
+        if not sent:
+            # Not connected; the next connection requests a fresh snapshot.
+            self._in_flight = False
+            return
+        timeout = self.timeout.current
+        await asyncio.sleep(timeout)
+        self.failures += 1
+        self.timeout.expired()
+        delay = min(BACKOFF_BASE * 2 ** (self.failures - 1), BACKOFF_MAX)
+        _LOG.warning(
+            "[%s] No mso %.1f s after getmso (%s), attempt %d; retrying in %.0f s",
+            self._log_id, timeout, self._reason, self.failures, delay,
+        )
+        if self._on_timeout:
+            self._on_timeout(self.failures)
+        await asyncio.sleep(delay)
+        self._in_flight = False
+        await self.request(self._reason)
+
+
+def drifted_roots(mirror: dict[str, Any], snapshot: dict[str, Any]) -> list[str]:
+    """Return the top-level mso keys where the local mirror differs from a fresh snapshot."""
+    keys = mirror.keys() | snapshot.keys()
+    return sorted(k for k in keys if mirror.get(k) != snapshot.get(k))
@@ -0,0 +1,75 @@
+"""
+Routing of Remote IR commands that have an exact mso equivalent.
+
+Input selection, loudness, night mode, Dirac, upmix, PEQ and mute codes
+become a ``changemso`` on the WebSocket that is already open. Menu and
+navigation codes, relative adjustments and multi-state toggles stay on
+``/ircmd``.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+_TOGGLE = object()
+
+
+@dataclass(frozen=True, slots=True)
+class MsoRoute:
+    """A replace at ``path``; the toggle sentinel flips a boolean instead."""
+
+    path: str
+    value: Any = _TOGGLE
+    # Path that must exist in the mirror, e.g. the input being selected.
+    requires: str = ""
+
+
+def _input(input_id: str) -> MsoRoute:
+    return MsoRoute("/input", input_id, requires=f"/inputs/{input_id}")
+
+
+MSO_ROUTES: dict[str, MsoRoute] = {
+    **{f"In HDMI {n}": _input(f"h{n}") for n in range(1, 9)},
+    **{f"In Analog {n}": _input(f"a{n}") for n in range(1, 3)},
+    **{f"In Optical {n}": _input(f"o{n}") for n in range(1, 4)},
+    **{f"In Coaxial {n}": _input(f"c{n}") for n in range(1, 4)},
+    "In USB": _input("usb"),
+    "In Bluetooth": _input("bt"),
+    "Loud On": MsoRoute("/loudness", "on"),
+    "Loud Off": MsoRoute("/loudness", "off"),
+    "Night On": MsoRoute("/night", "on"),
+    "Night Off": MsoRoute("/night", "off"),
+    "Dirac On": MsoRoute("/cal/diracactive", "on"),
+    "Dirac Off": MsoRoute("/cal/diracactive", "off"),
+    "Mode None": MsoRoute("/upmix/select", "off"),
+    "Mode Dolby Sur": MsoRoute("/upmix/select", "dolby"),
+    "Mode Neural-X": MsoRoute("/upmix/select", "dts"),
+    "Mode Native": MsoRoute("/upmix/select", "native"),
+    "Mode Auro": MsoRoute("/upmix/select", "auro"),
+    "PEQ Toggle": MsoRoute("/peq/peqsw"),
+    "Mute Toggle": MsoRoute("/muted"),
+    "Mute On": MsoRoute("/muted", True),
+    "Mute Off": MsoRoute("/muted", False),
+}
+
+
+def route_operations(command: str, state_value: Callable[[str], Any]) -> list[dict[str, Any]] | None:
+    """changemso operations equivalent to ``command``, or None to send it as IR."""
+    route = MSO_ROUTES.get(command)
+    if route is None:
+        return None
+    if route.requires and state_value(route.requires) is None:
+        return None
+    if route.value is _TOGGLE:
+        current = state_value(route.path)
+        if not isinstance(current, bool):
+            return None
+        value = not current
+    else:
+        value = route.value
+    return [{"op": "replace", "path": route.path, "value": value}]
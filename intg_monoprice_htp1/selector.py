@@ -8,13 +8,16 @@ Monoprice HTP-1 Select entities.
 from __future__ import annotations
 
 import logging
-from collections.abc import Awaitable, Callable
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
 from ucapi import StatusCodes
 from ucapi.select import Attributes, Commands, States
 from ucapi_framework import SelectEntity
 
+from intg_monoprice_htp1 import metrics
+from intg_monoprice_htp1.commands import REGISTRY, SELECT
+
 if TYPE_CHECKING:
     from intg_monoprice_htp1.config import HTP1Config
     from intg_monoprice_htp1.device import HTP1Device
@@ -32,7 +35,8 @@ class HTP1Select(SelectEntity):
         device: HTP1Device,
         get_options_fn: Callable[[], list[str]],
         get_current_fn: Callable[[], str],
-        command_fn: Callable[[str], Awaitable[bool]],
+        command: str,
+        state_keys: tuple[str, ...],
     ):
         super().__init__(
             entity_id,
@@ -47,11 +51,12 @@ class HTP1Select(SelectEntity):
         self._device = device
         self._get_options = get_options_fn
         self._get_current = get_current_fn
-        self._command_fn = command_fn
-        self.subscribe_to_device(device)
+        self._command = command
+        device.subscribe(self.sync_state, (*state_keys, "connection"))
 
+    @metrics.counted("htp1_entity_updates", entity="select")
     async def sync_state(self):
-        if not self._device.is_connected:
+        if not self._device.available:
             self.update({Attributes.STATE: States.UNAVAILABLE})
             return
         self.update({
@@ -65,12 +70,8 @@ class HTP1Select(SelectEntity):
     ) -> StatusCodes:
         if cmd_id != Commands.SELECT_OPTION:
             return StatusCodes.NOT_IMPLEMENTED
-        option = params.get("option") if params else None
-        if not option:
-            return StatusCodes.BAD_REQUEST
-        _LOG.info("[%s] Setting %s to: %s", self._device.log_id, self.name, option)
-        success = await self._command_fn(option)
-        return StatusCodes.OK if success else StatusCodes.SERVER_ERROR
+        _LOG.info("[%s] Setting %s to: %s", self._device.log_id, self.name, (params or {}).get("option"))
+        return await REGISTRY.dispatch(SELECT, self._command, self._device, params)
 
 
 def create_selects(config: HTP1Config, device: HTP1Device) -> list[HTP1Select]:
@@ -89,7 +90,8 @@ def create_selects(config: HTP1Config, device: HTP1Device) -> list[HTP1Select]:
             device,
             lambda: device.source_list,
             lambda: device.current_source,
-            lambda opt: device.select_source(opt),
+            "input",
+            ("input", "source_list"),
         ),
         HTP1Select(
             f"select.{device_id}.calibration",
@@ -97,7 +99,8 @@ def create_selects(config: HTP1Config, device: HTP1Device) -> list[HTP1Select]:
             device,
             lambda: device.slot_names,
             lambda: device.dirac_slot_name,
-            lambda opt: device.select_calibration(opt),
+            "calibration",
+            ("dirac_slot", "slot_names"),
         ),
         HTP1Select(
             f"select.{device_id}.surround_mode",
@@ -105,7 +108,8 @@ def create_selects(config: HTP1Config, device: HTP1Device) -> list[HTP1Select]:
             device,
             lambda opts=surround_options: opts,
             lambda: device.sound_mode_display,
-            lambda opt: device.select_sound_mode(opt),
+            "surround_mode",
+            ("sound_mode",),
         ),
         HTP1Select(
             f"select.{device_id}.ss_preset",
@@ -113,7 +117,8 @@ def create_selects(config: HTP1Config, device: HTP1Device) -> list[HTP1Select]:
             device,
             lambda opts=[1, 2, 3, 4, 5, 6]: opts,
             lambda: device.ss_preset,
-            lambda opt: device.select_ss_preset(int(opt)-1),
+            "ss_preset",
+            ("ss_preset",),
         ),
     ]
 
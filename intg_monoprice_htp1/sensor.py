@@ -13,6 +13,8 @@ from typing import TYPE_CHECKING
 from ucapi.sensor import Attributes, DeviceClasses, Options, States
 from ucapi_framework import SensorEntity
 
+from intg_monoprice_htp1 import metrics
+
 if TYPE_CHECKING:
     from intg_monoprice_htp1.config import HTP1Config
     from intg_monoprice_htp1.device import HTP1Device
@@ -44,10 +46,11 @@ class HTP1Sensor(SensorEntity):
         )
         self._device = device
         self._sensor_key = sensor_key
-        self.subscribe_to_device(device)
+        device.subscribe(self.sync_state, (sensor_key, "connection"))
 
+    @metrics.counted("htp1_entity_updates", entity="sensor")
     async def sync_state(self):
-        if not self._device.is_connected:
+        if not self._device.available:
             self.update({Attributes.STATE: States.UNAVAILABLE})
             return
         value = self._device.get_sensor_value(self._sensor_key) or "Unknown"
@@ -79,6 +82,7 @@ def create_sensors(config: HTP1Config, device: HTP1Device) -> list[HTP1Sensor]:
         HTP1Sensor(f"sensor.{device_id}.video_mode", f"{name} Video Mode", device, "video_mode", ""),
         HTP1Sensor(f"sensor.{device_id}.connection", f"{name} Connection", device, "connection", ""),
         HTP1Sensor(f"sensor.{device_id}.beq_active", f"{name} BEQ Filter", device, "beq_active", ""),
+        HTP1Sensor(f"sensor.{device_id}.latency", f"{name} Command Latency", device, "latency", ""),
     ]
 
     _LOG.info("Created %d sensor entities for %s", len(sensors), name)
@@ -15,6 +15,8 @@ from intg_monoprice_htp1.device import HTP1Device
 
 _LOG = logging.getLogger(__name__)
 
+SETUP_READY_TIMEOUT = 10.0  # seconds
+
 
 class HTP1SetupFlow(BaseSetupFlow[HTP1Config]):
     """Setup flow for Monoprice HTP-1 integration."""
@@ -54,22 +56,26 @@ class HTP1SetupFlow(BaseSetupFlow[HTP1Config]):
 
         # Test connection
         try:
+            identifier = f"htp1_{host.replace('.', '_')}"
+            # Macros are edited in the config file; keep them when reconfiguring.
+            existing = self.config.get(identifier) if self.config else None
             test_config = HTP1Config(
-                identifier=f"htp1_{host.replace('.', '_')}",
+                identifier=identifier,
                 name=name,
-                host=host
+                host=host,
+                macros=existing.macros if existing else {},
             )
 
-            # Quick connection test
+            # Connection test: an HTP-1 answers getmso with its full state
             test_device = HTP1Device(test_config)
-            connected = await asyncio.wait_for(
-                test_device.connect(),
-                timeout=10.0
-            )
-            await test_device.disconnect()
+            try:
+                await test_device.connect()
+                ready = await test_device.wait_ready(SETUP_READY_TIMEOUT)
+            finally:
+                await test_device.disconnect()
 
-            if not connected:
-                raise ValueError(f"Failed to connect to {host}")
+            if not ready:
+                raise asyncio.TimeoutError
 
             _LOG.info("Successfully connected to Monoprice HTP-1 at %s", host)
             return test_config
@@ -0,0 +1,95 @@
+"""
+Persisted mso snapshots for warm starts.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections.abc import Callable
+from typing import Any
+
+from intg_monoprice_htp1 import codec
+
+_LOG = logging.getLogger(__name__)
+
+SNAPSHOT_DELAY = 10.0  # seconds
+SNAPSHOT_MAX_DELAY = 60.0  # seconds
+
+
+class SnapshotStore:
+    """Debounced writer and loader for one device's last good mso."""
+
+    def __init__(
+        self,
+        path: str,
+        source: Callable[[], dict[str, Any] | None],
+        delay: float = SNAPSHOT_DELAY,
+        max_delay: float = SNAPSHOT_MAX_DELAY,
+    ):
+        self._path = path
+        self._source = source
+        self._delay = delay
+        self._max_delay = max(delay, max_delay)
+        self._first_change = 0.0
+        self._handle: asyncio.TimerHandle | None = None
+        self._write_task: asyncio.Task | None = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def load(self) -> dict[str, Any] | None:
+        """Read the snapshot from disk, or None if missing or unreadable."""
+        try:
+            with open(self._path, "rb") as f:
+                data = codec.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, *codec.DecodeError) as err:
+            _LOG.warning("Ignoring unreadable mso snapshot %s: %s", self._path, err)
+            return None
+        return data if isinstance(data, dict) else None
+
+    def schedule(self) -> None:
+        """Save the current mso once no further change arrives within the delay window.
+
+        A steady stream of changes still saves after ``SNAPSHOT_MAX_DELAY``.
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._handle is None:
+            self._first_change = now
+        else:
+            self._handle.cancel()
+        when = min(now + self._delay, self._first_change + self._max_delay)
+        self._handle = loop.call_at(when, self._flush)
+
+    def cancel(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _flush(self) -> None:
+        self._handle = None
+        state = self._source()
+        if not state:
+            return
+        # Serialize on the event loop, where the mirror is mutated; write off it.
+        payload = codec.dumps(state).encode()
+        self._write_task = asyncio.create_task(asyncio.to_thread(self._write, payload))
+
+    def _write(self, payload: bytes) -> None:
+        tmp_path = f"{self._path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, self._path)
+            _LOG.debug("Saved mso snapshot %s (%d bytes)", self._path, len(payload))
+        except OSError as err:
+            _LOG.warning("Could not save mso snapshot %s: %s", self._path, err)
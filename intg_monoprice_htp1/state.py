@@ -0,0 +1,333 @@
+"""
+Typed view of the Monoprice HTP-1 mso document.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+
+def _num(value: Any, default: int | float) -> int | float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return default
+
+
+def _str(value: Any, default: str = "") -> str:
+    return value if isinstance(value, str) else default
+
+
+def _dict(value: Any) -> dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _list(value: Any) -> list[Any]:
+    return value if isinstance(value, list) else []
+
+
+@dataclass(slots=True)
+class DiracSlot:
+    """A Dirac calibration slot."""
+
+    name: str = ""
+    valid: bool = False
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.name = _str(data.get("name"))
+        self.valid = bool(data.get("valid", False))
+
+
+@dataclass(slots=True)
+class Calibration:
+    """The ``/cal`` subtree: volume limits and Dirac slots."""
+
+    zero_point: int | float = 0
+    vpl: int | float = -80
+    vph: int | float = 12
+    dirac_active: Any = False
+    current_slot: int = 0
+    slots: list[DiracSlot] = field(default_factory=list)
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.zero_point = _num(data.get("zeroPoint"), 0)
+        self.vpl = _num(data.get("vpl"), -80)
+        self.vph = _num(data.get("vph"), 12)
+        self.dirac_active = data.get("diracactive", False)
+        self.current_slot = int(_num(data.get("currentdiracslot"), 0))
+        self.slots = [_build(DiracSlot, s) for s in _list(data.get("slots"))]
+
+
+@dataclass(slots=True)
+class ShakerPreset:
+    """A seat shaker preset."""
+
+    trim: int | float = 0
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.trim = _num(data.get("trim"), 0)
+
+
+@dataclass(slots=True)
+class Shaker:
+    """The ``/shaker`` subtree."""
+
+    mute: str = "off"
+    active_preset: int = 0
+    presets: dict[str, ShakerPreset] = field(default_factory=dict)
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.mute = _str(data.get("mute"), "off")
+        self.active_preset = int(_num(data.get("activePreset"), 0))
+        self.presets = {k: _build(ShakerPreset, v) for k, v in _dict(data.get("presets")).items()}
+
+    @property
+    def current_preset(self) -> ShakerPreset | None:
+        return self.presets.get(str(self.active_preset))
+
+
+@dataclass(slots=True)
+class InputInfo:
+    """A single entry of ``/inputs``."""
+
+    label: str = ""
+    visible: bool = False
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.label = _str(data.get("label"))
+        self.visible = bool(data.get("visible", False))
+
+
+@dataclass(slots=True)
+class Upmix:
+    """The ``/upmix`` subtree."""
+
+    select: str = ""
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.select = _str(data.get("select"))
+
+
+@dataclass(slots=True)
+class AudioStatus:
+    """The ``/status`` subtree: decoder and encoder formats."""
+
+    source_program: str = ""
+    program_format: str = ""
+    surround_mode: str = ""
+    listening_format: str = ""
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.source_program = _str(data.get("DECSourceProgram"))
+        self.program_format = _str(data.get("DECProgramFormat"))
+        self.surround_mode = _str(data.get("SurroundMode"))
+        self.listening_format = _str(data.get("ENCListeningFormat"))
+
+
+@dataclass(slots=True)
+class VideoStatus:
+    """The ``/videostat`` subtree."""
+
+    resolution: str = ""
+    hdr: str = ""
+    color_space: str = ""
+    mode: str = ""
+    bit_depth: str = ""
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.resolution = _str(data.get("VideoResolution"))
+        self.hdr = _str(data.get("HDRstatus"))
+        self.color_space = _str(data.get("VideoColorSpace"))
+        self.mode = _str(data.get("VideoMode"))
+        self.bit_depth = _str(data.get("VideoBitDepth"))
+
+
+@dataclass(slots=True)
+class PeqFilter:
+    """One channel's filter in a PEQ slot."""
+
+    fc: int | float = 100
+    gain_db: int | float = 0
+    q: int | float = 1
+    filter_type: int = 0
+    beq: bool = False
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.fc = _num(data.get("Fc"), 100)
+        self.gain_db = _num(data.get("gaindB"), 0)
+        self.q = _num(data.get("Q"), 1)
+        self.filter_type = int(_num(data.get("FilterType"), 0))
+        self.beq = bool(data.get("beq", False))
+
+
+@dataclass(slots=True)
+class PeqSlot:
+    """A PEQ slot holding one filter per channel."""
+
+    channels: dict[str, PeqFilter] = field(default_factory=dict)
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.channels = {k: _build(PeqFilter, v) for k, v in _dict(data.get("channels")).items()}
+
+
+@dataclass(slots=True)
+class Peq:
+    """The ``/peq`` subtree."""
+
+    peqsw: bool = False
+    beq_active: str = ""
+    location: str = ""
+    slots: list[PeqSlot] = field(default_factory=list)
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.peqsw = bool(data.get("peqsw", False))
+        self.beq_active = _str(data.get("beqActive"))
+        self.location = _str(data.get("location"))
+        self.slots = [_build(PeqSlot, s) for s in _list(data.get("slots"))]
+
+
+@dataclass(slots=True)
+class Speakers:
+    """The ``/speakers`` subtree; only group presence is modelled."""
+
+    present: dict[str, bool] = field(default_factory=dict)
+
+    def load(self, data: dict[str, Any]) -> None:
+        self.present = {
+            k: bool(v.get("present", False))
+            for k, v in _dict(data.get("groups")).items()
+            if isinstance(v, dict)
+        }
+
+
+def _build(cls: type, data: Any) -> Any:
+    obj = cls()
+    obj.load(_dict(data))
+    return obj
+
+
+_SUBTREES: dict[str, type] = {
+    "cal": Calibration,
+    "shaker": Shaker,
+    "upmix": Upmix,
+    "status": AudioStatus,
+    "videostat": VideoStatus,
+    "peq": Peq,
+    "speakers": Speakers,
+}
+
+
+@dataclass(slots=True)
+class HTP1State:
+    """
+    Typed, slotted view of the mso subtrees the integration reads.
+
+    Subtrees missing from the mso are ``None``. The raw mso stays the patch
+    target; ``refresh`` re-reads only the subtrees a patch touched.
+    """
+
+    power: bool = False
+    muted: bool = False
+    volume: int | float = 0
+    input: str | None = None
+    loudness: Any = "off"
+    night: Any = "off"
+    cal: Calibration | None = None
+    shaker: Shaker | None = None
+    inputs: dict[str, InputInfo] | None = None
+    upmix: Upmix | None = None
+    status: AudioStatus | None = None
+    videostat: VideoStatus | None = None
+    peq: Peq | None = None
+    speakers: Speakers | None = None
+
+    def load(self, mso: dict[str, Any]) -> None:
+        """Rebuild the whole model from a full mso document."""
+        self.power = bool(mso.get("powerIsOn", False))
+        self.muted = bool(mso.get("muted", False))
+        self.volume = _num(mso.get("volume"), 0)
+        self.input = mso.get("input")
+        self.loudness = mso.get("loudness", "off")
+        self.night = mso.get("night", "off")
+        self.inputs = self._load_inputs(mso)
+        for root in _SUBTREES:
+            self._load_subtree(root, mso)
+
+    def refresh(self, mso: dict[str, Any], paths: Iterable[str]) -> None:
+        """Update in place the parts of the model under the given patch paths."""
+        roots: set[str] = set()
+        peq_slots: set[int] = set()
+        whole_slots: list[int] = []
+        for path in paths:
+            if not path:
+                self.load(mso)
+                return
+            tokens = path[1:].split("/", 3)
+            index = tokens[2] if len(tokens) > 2 and tokens[0] == "peq" and tokens[1] == "slots" else ""
+            if index.isascii() and index.isdigit():
+                peq_slots.add(int(index))
+                if len(tokens) == 3:
+                    whole_slots.append(int(index))
+            else:
+                roots.add(tokens[0])
+
+        if len(whole_slots) > 1:
+            # A move within the array keeps its length but shifts every slot in between.
+            peq_slots.update(range(min(whole_slots), max(whole_slots) + 1))
+
+        for root in roots:
+            if root in _SUBTREES:
+                self._load_subtree(root, mso)
+            elif root == "inputs":
+                self.inputs = self._load_inputs(mso)
+            elif root == "powerIsOn":
+                self.power = bool(mso.get("powerIsOn", False))
+            elif root == "muted":
+                self.muted = bool(mso.get("muted", False))
+            elif root == "volume":
+                self.volume = _num(mso.get("volume"), 0)
+            elif root == "input":
+                self.input = mso.get("input")
+            elif root == "loudness":
+                self.loudness = mso.get("loudness", "off")
+            elif root == "night":
+                self.night = mso.get("night", "off")
+
+        if peq_slots and "peq" not in roots:
+            self._refresh_peq_slots(mso, peq_slots)
+
+    def _load_subtree(self, root: str, mso: dict[str, Any]) -> None:
+        data = mso.get(root)
+        if not isinstance(data, dict):
+            setattr(self, root, None)
+            return
+        current = getattr(self, root)
+        if current is None:
+            setattr(self, root, _build(_SUBTREES[root], data))
+        else:
+            current.load(data)
+
+    @staticmethod
+    def _load_inputs(mso: dict[str, Any]) -> dict[str, InputInfo] | None:
+        if "inputs" not in mso:
+            return None
+        inputs = {}
+        for inp_id, inp_info in _dict(mso["inputs"]).items():
+            info = _build(InputInfo, inp_info)
+            if not isinstance(inp_info, dict) or "label" not in inp_info:
+                info.label = inp_id
+            inputs[inp_id] = info
+        return inputs
+
+    def _refresh_peq_slots(self, mso: dict[str, Any], indices: set[int]) -> None:
+        raw_slots = _list(_dict(mso.get("peq")).get("slots"))
+        if self.peq is None or len(self.peq.slots) != len(raw_slots):
+            self._load_subtree("peq", mso)
+            return
+        for i in indices:
+            if i < len(raw_slots):
+                self.peq.slots[i].load(_dict(raw_slots[i]))
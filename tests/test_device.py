@@ -0,0 +1,65 @@
+"""
+Tests for HTP1Device mirror handling.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+import copy
+import json
+
+from benchmarks.fixtures import build_mso
+from intg_monoprice_htp1.config import HTP1Config
+from intg_monoprice_htp1.device import HTP1Device
+
+
+class FakeDevice(HTP1Device):
+    """HTP1Device that records outgoing frames instead of sending them."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sent: list[str] = []
+
+    async def send_message(self, message, priority=None, key=None) -> bool:
+        self.sent.append(message)
+        return True
+
+
+def test_resync_does_not_repeat_array_add():
+    async def run():
+        device = FakeDevice(HTP1Config("test", "Test", "127.0.0.1"))
+        mso = build_mso(peq_slots=4)
+        await device.handle_message("mso " + json.dumps(mso))
+
+        await device._verify_mirror("test")
+        new_slot = copy.deepcopy(mso["peq"]["slots"][0])
+        new_slot["channels"]["sub1"]["gaindB"] = 3
+        patch = [{"op": "add", "path": "/peq/slots/-", "value": new_slot}]
+        await device.handle_message("msoupdate " + json.dumps(patch))
+
+        # The reply to getmso already includes the buffered patch.
+        mso["peq"]["slots"].append(new_slot)
+        await device.handle_message("mso " + json.dumps(mso))
+        return device
+
+    device = asyncio.run(run())
+    assert len(device.state_value("/peq/slots")) == 5
+    assert device.state_value("/peq/slots/4/channels/sub1/gaindB") == 3
+    assert len(device.model.peq.slots) == 5
+    assert device.drift_stats == {"checks": 1, "drifted": 0, "last_drifted_roots": []}
+
+
+def test_routed_remote_command_records_one_latency_sample():
+    async def run():
+        device = FakeDevice(HTP1Config("test", "Test", "127.0.0.1"))
+        device._is_connected = True
+        await device.handle_message("mso " + json.dumps(build_mso()))
+        assert await device.send_remote_command("In HDMI 2")
+        await device.handle_message("msoupdate " + json.dumps([{"op": "replace", "path": "/input", "value": "h2"}]))
+        return device
+
+    device = asyncio.run(run())
+    assert device.route_stats["ws"] == 1
+    assert list(device.latency.histograms) == ["input/ws"]
+    assert device.latency.samples == 1
@@ -0,0 +1,44 @@
+"""
+Tests for the ircmd circuit breaker.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+
+from intg_monoprice_htp1.http_client import CircuitBreaker, HTTPCommandClient
+
+
+class HangingClient(HTTPCommandClient):
+    """Client whose requests never complete."""
+
+    def _get_session(self):
+        class Session:
+            def get(self, *args, **kwargs):
+                class Request:
+                    async def __aenter__(self):
+                        await asyncio.Event().wait()
+
+                    async def __aexit__(self, *exc):
+                        return False
+
+                return Request()
+
+        return Session()
+
+
+def test_cancelled_trial_does_not_stick_half_open():
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    breaker.failure()
+
+    async def run():
+        client = HangingClient("127.0.0.1", "test", breaker=breaker)
+        task = asyncio.create_task(client.ircmd("menu"))
+        await asyncio.sleep(0.01)
+        assert breaker.state == "half-open"
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    assert breaker.allow()
@@ -0,0 +1,65 @@
+"""
+Tests for user-defined macros.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+
+from intg_monoprice_htp1.http_client import MAX_CONCURRENT
+from intg_monoprice_htp1.macros import MacroRunner, compile_macros
+
+
+class FakeDevice:
+    log_id = "test"
+
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _send(self, kind: str, name: str) -> bool:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.calls.append((kind, name))
+        return True
+
+    async def send_remote_command(self, command: str) -> bool:
+        return await self._send("remote", command)
+
+    async def send_http_command(self, code: str) -> bool:
+        return await self._send("http", code)
+
+    def state_value(self, path):
+        return None
+
+
+def _run(definition):
+    device = FakeDevice()
+    runner = MacroRunner(device, compile_macros({"Test": definition}))
+
+    async def run():
+        return await runner._execute("Test", runner._macros["Test"])
+
+    return device, asyncio.run(run())
+
+
+def test_named_steps_go_through_remote_command_routing():
+    device, ok = _run([{"ir": "Dirac On"}, {"ir": "7887"}])
+    assert ok
+    assert sorted(device.calls) == [("http", "7887"), ("remote", "Dirac On")]
+
+
+def test_consecutive_ir_steps_are_sent_concurrently_within_the_pool():
+    device, ok = _run([{"ir": "Dirac On"}] * (MAX_CONCURRENT + 2))
+    assert ok
+    assert device.peak == MAX_CONCURRENT
+
+
+def test_other_steps_keep_ir_steps_in_order():
+    device, ok = _run([{"ir": "1111"}, {"delay": 0}, {"ir": "2222"}])
+    assert ok
+    assert device.calls == [("http", "1111"), ("http", "2222")]
@@ -0,0 +1,27 @@
+"""
+Tests for the RFC 6902 patch engine.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from intg_monoprice_htp1.patch import APPEND, apply_patch, compile_path
+
+
+def test_compile_path_indices():
+    assert compile_path("/peq/slots/3") == (("peq", None), ("slots", None), ("3", 3))
+    assert compile_path("/peq/slots/-")[-1] == ("-", APPEND)
+    assert compile_path("/peq/slots/03")[-1] == ("03", None)
+
+
+def test_compile_path_non_ascii_digits_are_keys():
+    assert compile_path("/a/²")[-1] == ("²", None)
+    assert compile_path("/a/٣")[-1] == ("٣", None)
+
+
+def test_non_ascii_digit_index_is_rejected_as_bad_patch():
+    doc = {"peq": {"slots": [{"gaindB": 0}]}}
+    result = apply_patch(doc, [{"op": "replace", "path": "/peq/slots/٣/gaindB", "value": 3}])
+    assert not result.ok
+    assert result.applied == 0
+    assert doc["peq"]["slots"] == [{"gaindB": 0}]
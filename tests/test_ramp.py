@@ -0,0 +1,33 @@
+"""
+Tests for stepped volume ramps.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+
+from intg_monoprice_htp1.ramp import VolumeRamp
+
+
+def test_retarget_after_cancel_survives_old_task_unwinding():
+    sent = []
+
+    async def send(volume):
+        sent.append(volume)
+        return True
+
+    async def run():
+        ramp = VolumeRamp(send, lambda: sent[-1] if sent else -40, lambda: (-80, 12), rate=1000)
+        ramp.retarget(-30)
+        await asyncio.sleep(0)
+        ramp.cancel()
+        ramp.retarget(-50)
+        task = ramp._task
+        await asyncio.sleep(0.1)
+        return ramp, task
+
+    ramp, task = asyncio.run(run())
+    assert task.done()
+    assert sent[-1] == -50
+    assert ramp.target is None and ramp._task is None
@@ -0,0 +1,68 @@
+"""
+Tests for persisted mso snapshots.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+import asyncio
+
+from intg_monoprice_htp1.optimistic import OptimisticOverlay
+from intg_monoprice_htp1.snapshot import SnapshotStore
+
+
+def test_schedule_debounces_a_burst(tmp_path):
+    saves = []
+
+    def source():
+        saves.append(asyncio.get_running_loop().time())
+        return None
+
+    async def run():
+        store = SnapshotStore(str(tmp_path / "mso.json"), source, delay=0.05, max_delay=1.0)
+        started = asyncio.get_running_loop().time()
+        for _ in range(4):
+            store.schedule()
+            await asyncio.sleep(0.03)
+        await asyncio.sleep(0.1)
+        return started
+
+    started = asyncio.run(run())
+    assert len(saves) == 1
+    assert saves[0] - started >= 0.12
+
+
+def test_schedule_saves_within_max_delay(tmp_path):
+    saves = []
+
+    async def run():
+        store = SnapshotStore(str(tmp_path / "mso.json"), lambda: saves.append(1), delay=0.05, max_delay=0.1)
+        for _ in range(10):
+            store.schedule()
+            await asyncio.sleep(0.03)
+        store.cancel()
+
+    asyncio.run(run())
+    assert len(saves) >= 2
+
+
+def test_snapshot_excludes_unconfirmed_writes(tmp_path):
+    state = {"volume": -30, "muted": False}
+    overlay = OptimisticOverlay()
+    overlay.apply(state, [{"op": "replace", "path": "/volume", "value": -20}], 0.0)
+
+    async def run():
+        store = SnapshotStore(str(tmp_path / "mso.json"), lambda: overlay.confirmed_document(state), delay=0)
+        store.schedule()
+        await asyncio.sleep(0.01)
+        await store._write_task
+        return store.load()
+
+    assert asyncio.run(run()) == {"volume": -30, "muted": False}
+    assert state["volume"] == -20
+
+
+def test_load_ignores_corrupt_snapshot(tmp_path):
+    path = tmp_path / "mso.json"
+    path.write_bytes(b'{"volume": -3')
+    assert SnapshotStore(str(path), lambda: None).load() is None
@@ -0,0 +1,49 @@
+"""
+Tests for the typed mso model.
+
+:copyright: (c) 2026 by Meir Miyara.
+:license: MPL-2.0, see LICENSE for more details.
+"""
+
+from intg_monoprice_htp1.patch import apply_patch
+from intg_monoprice_htp1.state import HTP1State
+
+
+def _mso(gains):
+    return {"peq": {"slots": [{"channels": {"sub1": {"gaindB": g}}} for g in gains]}}
+
+
+def _gains(model):
+    return [slot.channels["sub1"].gain_db for slot in model.peq.slots]
+
+
+def test_refresh_after_move_within_peq_slots():
+    mso = _mso([0, 1, 2, 3, 4])
+    model = HTP1State()
+    model.load(mso)
+
+    result = apply_patch(mso, [{"op": "move", "from": "/peq/slots/0", "path": "/peq/slots/4"}])
+    model.refresh(mso, result.paths)
+
+    assert _gains(model) == [1, 2, 3, 4, 0]
+
+
+def test_refresh_after_filter_change_reloads_one_slot():
+    mso = _mso([0, 1, 2])
+    model = HTP1State()
+    model.load(mso)
+
+    result = apply_patch(mso, [{"op": "replace", "path": "/peq/slots/1/channels/sub1/gaindB", "value": 5}])
+    model.refresh(mso, result.paths)
+
+    assert _gains(model) == [0, 5, 2]
+
+
+def test_refresh_ignores_non_ascii_digit_slot_index():
+    mso = _mso([0, 1])
+    model = HTP1State()
+    model.load(mso)
+
+    model.refresh(mso, ["/peq/slots/²/channels/sub1/gaindB"])
+
+    assert _gains(model) == [0, 1]